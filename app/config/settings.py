@@ -2,7 +2,8 @@
 Configuration management using Pydantic settings.
 Loads configuration from environment variables.
 """
-from typing import Dict
+import sys
+from typing import Dict, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -36,6 +37,8 @@ class ScannerConfig(BaseSettings):
     email_summary_interval_hours: int = Field(2, alias="SCANNER__EMAIL_SUMMARY_INTERVAL_HOURS")
     risk_percentage: float = Field(0.01, alias="SCANNER__RISK_PERCENTAGE")
     default_equity: float = Field(10000, alias="SCANNER__DEFAULT_EQUITY")
+    cache_dir: Optional[str] = Field(None, alias="SCANNER__CACHE_DIR")
+    max_cache_entries: Optional[int] = Field(None, alias="SCANNER__MAX_CACHE_ENTRIES")
     
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
     
@@ -48,7 +51,8 @@ class ScannerConfig(BaseSettings):
         
         for key, value in os.environ.items():
             if key.startswith(prefix):
-                alias = key[len(prefix):]
+                # Interned so per-symbol state dicts hash and compare by identity
+                alias = sys.intern(key[len(prefix):])
                 symbols[alias] = value
         
         return symbols
@@ -1,11 +1,57 @@
 """Fair Value Gap (FVG) detector"""
+import numpy as np
 import pandas as pd
+from dataclasses import dataclass
 from typing import List, Dict
 import logging
 
+from app.core.strategy.ohlc_cache import OHLCCache
+from app.core.strategy.technical_utils import DIRECTION_BEARISH, DIRECTION_BULLISH
+
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class FVGRecords:
+    """
+    Detected FVGs stored as parallel arrays (one element per FVG).
+    
+    Attributes:
+        start_idx: Start index
+        end_idx: End index
+        gap_high: Upper bound of gap
+        gap_low: Lower bound of gap
+        direction_code: DIRECTION_BULLISH or DIRECTION_BEARISH (uint8)
+        timestamps: Timestamp of the middle candle
+    """
+    start_idx: np.ndarray
+    end_idx: np.ndarray
+    gap_high: np.ndarray
+    gap_low: np.ndarray
+    direction_code: np.ndarray
+    timestamps: pd.Index
+    
+    def __len__(self) -> int:
+        return len(self.direction_code)
+    
+    def to_dicts(self) -> List[Dict]:
+        """Convert to the list-of-dicts format returned by detect_fvgs"""
+        return [
+            {
+                'start_idx': start_idx,
+                'end_idx': end_idx,
+                'gap_high': self.gap_high[k],
+                'gap_low': self.gap_low[k],
+                'direction': 'bullish' if self.direction_code[k] == DIRECTION_BULLISH else 'bearish',
+                'direction_code': self.direction_code[k],
+                'timestamp': self.timestamps[k]
+            }
+            for k, (start_idx, end_idx) in enumerate(
+                zip(self.start_idx.tolist(), self.end_idx.tolist())
+            )
+        ]
+
+
 class IFvgDetector:
     """
     Detects Fair Value Gaps in OHLC data.
@@ -30,41 +76,51 @@ class IFvgDetector:
             - gap_high: Upper bound of gap
             - gap_low: Lower bound of gap
             - direction: "bullish" or "bearish"
+            - direction_code: DIRECTION_BULLISH or DIRECTION_BEARISH (uint8)
         """
-        if len(df) < 3:
-            return []
+        return self.detect_fvgs_from_arrays(OHLCCache.build(df), lookback=lookback).to_dicts()
+    
+    def detect_fvgs_from_arrays(self, cache: OHLCCache, lookback: int = 50) -> FVGRecords:
+        """
+        Detect FVGs from cached OHLC arrays.
         
-        fvgs = []
+        Args:
+            cache: OHLC arrays of the timeframe
+            lookback: Number of recent candles to analyze
         
+        Returns:
+            FVGRecords with one element per detected FVG
+        """
         # Analyze recent candles
-        recent_df = df.tail(lookback) if len(df) > lookback else df
+        h = cache.h[-lookback:]
+        l = cache.l[-lookback:]
+        index = cache.index[-lookback:]
+        
+        # Candle i is compared through its neighbours i - 1 and i + 1
+        prev_high = h[:-2]
+        prev_low = l[:-2]
+        next_high = h[2:]
+        next_low = l[2:]
+        
+        # Bullish FVG: gap between prev high and next low
+        bull_mask = prev_high < next_low
+        # Bearish FVG: gap between prev low and next high
+        bear_mask = ~bull_mask & (prev_low > next_high)
+        
+        # Fewer than 3 candles leave the slices above empty
+        found = np.flatnonzero(bull_mask | bear_mask)
+        is_bull = bull_mask[found]
         
-        for i in range(1, len(recent_df) - 1):
-            prev_candle = recent_df.iloc[i - 1]
-            curr_candle = recent_df.iloc[i]
-            next_candle = recent_df.iloc[i + 1]
-            
-            # Bullish FVG: gap between prev high and next low
-            if prev_candle['high'] < next_candle['low']:
-                fvgs.append({
-                    'start_idx': i - 1,
-                    'end_idx': i + 1,
-                    'gap_high': next_candle['low'],
-                    'gap_low': prev_candle['high'],
-                    'direction': 'bullish',
-                    'timestamp': recent_df.index[i]
-                })
-            
-            # Bearish FVG: gap between prev low and next high
-            elif prev_candle['low'] > next_candle['high']:
-                fvgs.append({
-                    'start_idx': i - 1,
-                    'end_idx': i + 1,
-                    'gap_high': prev_candle['low'],
-                    'gap_low': next_candle['high'],
-                    'direction': 'bearish',
-                    'timestamp': recent_df.index[i]
-                })
+        fvgs = FVGRecords(
+            start_idx=found,
+            end_idx=found + 2,
+            gap_high=np.where(is_bull, next_low[found], prev_low[found]),
+            gap_low=np.where(is_bull, prev_high[found], next_high[found]),
+            direction_code=np.where(
+                is_bull, DIRECTION_BULLISH, DIRECTION_BEARISH
+            ).astype(np.uint8),
+            timestamps=index[found + 1]
+        )
         
-        logger.debug(f"Detected {len(fvgs)} FVGs in {len(recent_df)} candles")
+        logger.debug(f"Detected {len(fvgs)} FVGs in {len(h)} candles")
         return fvgs
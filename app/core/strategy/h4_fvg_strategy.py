@@ -1,21 +1,29 @@
 """H4 FVG/Order Block strategy implementation"""
+import asyncio
 import logging
+from math import fabs
+import numpy as np
 from typing import Optional
-from datetime import datetime, timedelta
+from datetime import timedelta
 from sqlalchemy.orm import Session
 
 from app.core.domain.multi_timeframe_context import MultiTimeframeContext
 from app.core.domain.signal import Signal
 from app.core.strategy.strategy_protocol import TradeContext, TradeUpdateAction
-from app.core.strategy.fvg_detector import IFvgDetector
-from app.core.strategy.ob_detector import IOrderBlockDetector
+from app.core.strategy.fvg_detector import IFvgDetector, FVGRecords
+from app.core.strategy.ob_detector import IOrderBlockDetector, OBRecords
+from app.core.strategy.ohlc_cache import OHLCCache
 from app.core.strategy.technical_utils import (
-    detect_bos, detect_choch, detect_liquidity_sweep, identify_swing_points
+    has_bos, has_choch, has_liquidity_sweep, identify_swing_points
+)
+from app.core.sl_tp.sl_tp_estimator import (
+    SignalContext, OpenTradeAnalytics, SlTpAdjustment, DynamicSlTpEstimator
 )
-from app.core.sl_tp.sl_tp_estimator import SignalContext, DynamicSlTpEstimator
 
 logger = logging.getLogger(__name__)
 
+_ONE_HOUR = timedelta(hours=1)
+
 
 class H4FvgStrategy:
     """
@@ -51,7 +59,7 @@ class H4FvgStrategy:
         self.ob_detector = ob_detector or IOrderBlockDetector()
         self.sl_tp_estimator = sl_tp_estimator or DynamicSlTpEstimator(db, config)
         
-        # Track last H4 candle timestamp per symbol to detect closes
+        # Track last H4 candle timestamp (int64 ns) per symbol to detect closes
         self.last_h4_timestamp = {}
     
     async def evaluate_new_signal(
@@ -75,45 +83,10 @@ class H4FvgStrategy:
             Signal if conditions met, None otherwise
         """
         try:
-            # Step 1: Check if H4 candle just closed
-            if not self._has_h4_candle_closed(ctx):
-                logger.debug(f"{ctx.alias}: No new H4 candle close")
-                return None
-            
-            logger.info(f"{ctx.alias}: New H4 candle closed, evaluating for signal...")
-            
-            # Step 2: Detect H4 FVGs and OBs for bias
-            h4_fvgs = self.fvg_detector.detect_fvgs(ctx.h4, lookback=20)
-            h4_obs = self.ob_detector.detect_order_blocks(ctx.h4, lookback=20)
-            
-            if not h4_fvgs and not h4_obs:
-                logger.debug(f"{ctx.alias}: No H4 FVGs or OBs detected")
-                return None
-            
-            # Determine bias from most recent FVG/OB
-            bias = self._determine_bias(h4_fvgs, h4_obs)
+            bias = await self._evaluate_bias(ctx)
             if not bias:
-                logger.debug(f"{ctx.alias}: Could not determine clear bias")
-                return None
-            
-            logger.info(f"{ctx.alias}: H4 bias is {bias}")
-            
-            # Step 3: Check H1/M30/M15 for structure confirmation
-            structure_confirmed = self._check_structure_confirmation(ctx, bias)
-            if not structure_confirmed:
-                logger.debug(f"{ctx.alias}: Structure not confirmed on lower timeframes")
-                return None
-            
-            logger.info(f"{ctx.alias}: Structure confirmed")
-            
-            # Step 4: Check M5/M1 for entry confirmation
-            entry_confirmed = self._check_entry_confirmation(ctx, bias)
-            if not entry_confirmed:
-                logger.debug(f"{ctx.alias}: Entry not confirmed on M5/M1")
                 return None
             
-            logger.info(f"{ctx.alias}: Entry confirmed - generating signal!")
-            
             # Step 5: Generate signal with SL/TP
             signal = await self._generate_signal(ctx, bias)
             return signal
@@ -122,57 +95,128 @@ class H4FvgStrategy:
             logger.error(f"Error evaluating signal for {ctx.alias}: {e}", exc_info=True)
             return None
     
-    def _has_h4_candle_closed(self, ctx: MultiTimeframeContext) -> bool:
+    async def _evaluate_bias(self, ctx: MultiTimeframeContext) -> Optional[str]:
         """
-        Check if a new H4 candle has closed since last check.
+        Run steps 1-4 of evaluate_new_signal.
         
         Args:
             ctx: Multi-timeframe context
         
+        Returns:
+            "buy" or "sell" if a new H4 close is confirmed on all timeframes,
+            None otherwise
+        """
+        # Extract OHLC arrays once per timeframe for all detectors.
+        # Structure, OB and sweep detection run on float32; the entry check
+        # and SL/TP keep reading the full-precision frame prices.
+        h4 = OHLCCache.build(ctx.h4, dtype=np.float32)
+        
+        # Step 1: Check if H4 candle just closed
+        if not self._has_h4_candle_closed(ctx.alias, h4):
+            logger.debug(f"{ctx.alias}: No new H4 candle close")
+            return None
+        
+        logger.info(f"{ctx.alias}: New H4 candle closed, evaluating for signal...")
+        
+        # Steps 2-4 are CPU-bound; run them off the event loop
+        return await asyncio.to_thread(self._evaluate_sync, ctx, h4)
+    
+    def _evaluate_sync(self, ctx: MultiTimeframeContext, h4: OHLCCache) -> Optional[str]:
+        """
+        Run the detector, structure and entry checks for a new H4 close.
+        
+        Touches no shared state, so it is safe to run in a worker thread.
+        
+        Args:
+            ctx: Multi-timeframe context
+            h4: H4 OHLC arrays
+        
+        Returns:
+            "buy" or "sell" if all checks align, None otherwise
+        """
+        h1 = OHLCCache.build(ctx.h1, dtype=np.float32)
+        m15 = OHLCCache.build(ctx.m15, dtype=np.float32)
+        
+        # Step 2: Detect H4 FVGs and OBs for bias
+        h4_fvgs = self.fvg_detector.detect_fvgs_from_arrays(h4, lookback=20)
+        h4_obs = self.ob_detector.detect_order_blocks_from_arrays(h4, lookback=20)
+        
+        if not h4_fvgs and not h4_obs:
+            logger.debug(f"{ctx.alias}: No H4 FVGs or OBs detected")
+            return None
+        
+        # Determine bias from most recent FVG/OB
+        bias = self._determine_bias(h4_fvgs, h4_obs)
+        if not bias:
+            logger.debug(f"{ctx.alias}: Could not determine clear bias")
+            return None
+        
+        logger.info(f"{ctx.alias}: H4 bias is {bias}")
+        
+        # Step 3: Check H1/M30/M15 for structure confirmation
+        structure_confirmed = self._check_structure_confirmation(h1, m15, bias)
+        if not structure_confirmed:
+            logger.debug(f"{ctx.alias}: Structure not confirmed on lower timeframes")
+            return None
+        
+        logger.info(f"{ctx.alias}: Structure confirmed")
+        
+        # Step 4: Check M5/M1 for entry confirmation. Kept in the frame's
+        # dtype: the close-vs-close trend test can flip on float32 rounding.
+        m5 = OHLCCache.build(ctx.m5)
+        entry_confirmed = self._check_entry_confirmation(m5, bias)
+        if not entry_confirmed:
+            logger.debug(f"{ctx.alias}: Entry not confirmed on M5/M1")
+            return None
+        
+        logger.info(f"{ctx.alias}: Entry confirmed - generating signal!")
+        return bias
+    
+    def _has_h4_candle_closed(self, alias: str, h4: OHLCCache) -> bool:
+        """
+        Check if a new H4 candle has closed since last check.
+        
+        Args:
+            alias: Symbol alias
+            h4: H4 OHLC arrays
+        
         Returns:
             True if new H4 candle closed, False otherwise
         """
-        if ctx.h4.empty:
+        current_h4_timestamp = h4.last_ts
+        if current_h4_timestamp is None:
             return False
         
-        current_h4_timestamp = ctx.h4.index[-1]
-        last_timestamp = self.last_h4_timestamp.get(ctx.alias)
-        
-        # Update last timestamp
-        self.last_h4_timestamp[ctx.alias] = current_h4_timestamp
+        last_timestamp = self.last_h4_timestamp.get(alias)
         
-        # If this is first check or timestamp changed, candle closed
-        if last_timestamp is None or current_h4_timestamp > last_timestamp:
+        # First check for this symbol: candle closed
+        if last_timestamp is None:
+            self.last_h4_timestamp[alias] = current_h4_timestamp
             return True
         
-        return False
+        # Only write back when the timestamp actually changed
+        if current_h4_timestamp == last_timestamp:
+            return False
+        
+        self.last_h4_timestamp[alias] = current_h4_timestamp
+        return current_h4_timestamp > last_timestamp
     
-    def _determine_bias(self, fvgs: list, obs: list) -> Optional[str]:
+    def _determine_bias(self, fvgs: FVGRecords, obs: OBRecords) -> Optional[str]:
         """
         Determine market bias from FVGs and OBs.
         
         Args:
-            fvgs: List of detected FVGs
-            obs: List of detected Order Blocks
+            fvgs: Detected FVGs
+            obs: Detected Order Blocks
         
         Returns:
             "buy" or "sell" if clear bias, None otherwise
         """
-        # Count bullish vs bearish signals
-        bullish_count = 0
-        bearish_count = 0
-        
-        for fvg in fvgs[-3:]:  # Look at last 3 FVGs
-            if fvg['direction'] == 'bullish':
-                bullish_count += 1
-            else:
-                bearish_count += 1
-        
-        for ob in obs[-3:]:  # Look at last 3 OBs
-            if ob['direction'] == 'bullish':
-                bullish_count += 1
-            else:
-                bearish_count += 1
+        # Count bullish vs bearish signals over the last 3 FVGs and last 3 OBs
+        recent_fvg_codes = fvgs.direction_code[-3:]
+        recent_ob_codes = obs.direction_code[-3:]
+        bullish_count = int(recent_fvg_codes.sum()) + int(recent_ob_codes.sum())
+        bearish_count = len(recent_fvg_codes) + len(recent_ob_codes) - bullish_count
         
         # Need clear bias (at least 2:1 ratio)
         if bullish_count > bearish_count * 2:
@@ -184,84 +228,75 @@ class H4FvgStrategy:
     
     def _check_structure_confirmation(
         self,
-        ctx: MultiTimeframeContext,
+        h1: OHLCCache,
+        m15: OHLCCache,
         bias: str
     ) -> bool:
         """
         Check for structure confirmation on H1/M30/M15.
         
         Args:
-            ctx: Multi-timeframe context
+            h1: H1 OHLC arrays
+            m15: M15 OHLC arrays
             bias: Market bias ("buy" or "sell")
         
         Returns:
             True if structure confirms bias, False otherwise
         """
-        # Check H1 for BOS/CHOCH
-        h1_bos = detect_bos(ctx.h1, lookback=20)
-        h1_choch = detect_choch(ctx.h1, lookback=20)
+        bullish = bias == "buy"
         
-        # Check M15 for liquidity sweeps
-        m15_sweeps = detect_liquidity_sweep(ctx.m15, lookback=20)
+        # Any single confirmation is enough, so check the cheapest first:
+        # H1 BOS, then M15 liquidity sweep, then H1 CHOCH
+        if has_bos(h1, bullish, lookback=20):
+            return True
         
-        # For bullish bias, look for bullish structure
-        if bias == "buy":
-            has_bullish_bos = any(b['type'] == 'bullish_bos' for b in h1_bos)
-            has_bullish_choch = any(c['type'] == 'bullish_choch' for c in h1_choch)
-            has_bullish_sweep = any(s['type'] == 'bullish_sweep' for s in m15_sweeps)
-            
-            # Need at least one confirmation
-            return has_bullish_bos or has_bullish_choch or has_bullish_sweep
+        if has_liquidity_sweep(m15, bullish, lookback=20):
+            return True
         
-        # For bearish bias, look for bearish structure
-        else:
-            has_bearish_bos = any(b['type'] == 'bearish_bos' for b in h1_bos)
-            has_bearish_choch = any(c['type'] == 'bearish_choch' for c in h1_choch)
-            has_bearish_sweep = any(s['type'] == 'bearish_sweep' for s in m15_sweeps)
-            
-            return has_bearish_bos or has_bearish_choch or has_bearish_sweep
+        return has_choch(h1, bullish, lookback=20)
     
     def _check_entry_confirmation(
         self,
-        ctx: MultiTimeframeContext,
+        m5: OHLCCache,
         bias: str
     ) -> bool:
         """
         Check for entry confirmation on M5/M1.
         
         Args:
-            ctx: Multi-timeframe context
+            m5: M5 OHLC arrays
             bias: Market bias ("buy" or "sell")
         
         Returns:
             True if entry confirmed, False otherwise
         """
         # Check last few M5 candles for wick rejection
-        if len(ctx.m5) < 3:
+        if len(m5) < 3:
             return False
         
-        last_candles = ctx.m5.tail(3)
-        
-        for _, candle in last_candles.iterrows():
-            # For buy: look for bullish wick rejection (long lower wick, close near high)
-            if bias == "buy":
-                body_size = abs(candle['close'] - candle['open'])
-                lower_wick = min(candle['open'], candle['close']) - candle['low']
-                
-                # Wick should be at least 2x body size
-                if lower_wick > body_size * 2 and candle['close'] > candle['open']:
-                    return True
+        o = m5.o[-3:]
+        h = m5.h[-3:]
+        l = m5.l[-3:]
+        c = m5.c[-3:]
+        body_size = np.abs(c - o)
+        
+        # For buy: look for bullish wick rejection (long lower wick, close near high)
+        if bias == "buy":
+            lower_wick = np.minimum(o, c) - l
+            
+            # Wick should be at least 2x body size
+            if np.any((lower_wick > body_size * 2) & (c > o)):
+                return True
+        
+        # For sell: look for bearish wick rejection (long upper wick, close near low)
+        else:
+            upper_wick = h - np.maximum(o, c)
             
-            # For sell: look for bearish wick rejection (long upper wick, close near low)
-            else:
-                body_size = abs(candle['close'] - candle['open'])
-                upper_wick = candle['high'] - max(candle['open'], candle['close'])
-                
-                if upper_wick > body_size * 2 and candle['close'] < candle['open']:
-                    return True
+            if np.any((upper_wick > body_size * 2) & (c < o)):
+                return True
         
         # If no clear wick rejection, accept if recent trend aligns
-        recent_trend_up = ctx.m5['close'].iloc[-1] > ctx.m5['close'].iloc[-5]
+        recent_trend_up = m5.c[-1] > m5.c[-5]
         
         if bias == "buy" and recent_trend_up:
             return True
@@ -285,11 +320,32 @@ class H4FvgStrategy:
         Returns:
             Generated signal
         """
+        signal_ctx = self._build_signal_context(ctx, bias)
+        
+        # Estimate SL/TP
+        sl_price, tp_price = await self.sl_tp_estimator.estimate_for_new_signal(signal_ctx)
+        
+        return self._build_signal(ctx, bias, sl_price, tp_price)
+    
+    def _build_signal_context(
+        self,
+        ctx: MultiTimeframeContext,
+        bias: str
+    ) -> SignalContext:
+        """
+        Build the SL/TP estimation input for a confirmed signal.
+        
+        Args:
+            ctx: Multi-timeframe context
+            bias: Market bias ("buy" or "sell")
+        
+        Returns:
+            SignalContext for the estimator
+        """
         # Identify swing points
         swing_highs, swing_lows = identify_swing_points(ctx.h4, window=5)
         
-        # Create signal context for SL/TP estimation
-        signal_ctx = SignalContext(
+        return SignalContext(
             symbol_alias=ctx.alias,
             yf_symbol=ctx.yf_symbol,
             direction=bias,
@@ -299,17 +355,32 @@ class H4FvgStrategy:
             recent_swing_highs=swing_highs,
             recent_swing_lows=swing_lows
         )
+    
+    def _build_signal(
+        self,
+        ctx: MultiTimeframeContext,
+        bias: str,
+        sl_price: float,
+        tp_price: float
+    ) -> Signal:
+        """
+        Create the signal once SL/TP are known.
         
-        # Estimate SL/TP
-        sl_price, tp_price = await self.sl_tp_estimator.estimate_for_new_signal(signal_ctx)
+        Args:
+            ctx: Multi-timeframe context
+            bias: Market bias ("buy" or "sell")
+            sl_price: Estimated stop loss
+            tp_price: Estimated take profit
         
+        Returns:
+            Generated signal
+        """
         # Calculate estimated RR
-        sl_distance = abs(ctx.current_price - sl_price)
-        tp_distance = abs(tp_price - ctx.current_price)
+        sl_distance = fabs(ctx.current_price - sl_price)
+        tp_distance = fabs(tp_price - ctx.current_price)
         estimated_rr = tp_distance / sl_distance if sl_distance > 0 else 0
         
-        # Create signal
-        signal = Signal(
+        return Signal(
             symbol_alias=ctx.alias,
             yf_symbol=ctx.yf_symbol,
             direction=bias,
@@ -321,8 +392,6 @@ class H4FvgStrategy:
             notes=f"H4 bias: {bias}, multi-timeframe confirmation",
             estimated_rr=estimated_rr
         )
-        
-        return signal
     
     async def evaluate_open_trade(
         self,
@@ -345,69 +414,108 @@ class H4FvgStrategy:
             TradeUpdateAction if action needed, None otherwise
         """
         try:
-            # Check if SL hit
-            if ctx.direction == "buy" and ctx.candle_low <= ctx.current_sl:
-                return TradeUpdateAction(
-                    action_type="close_by_sl",
-                    new_state="ClosedBySl",
-                    close_price=ctx.current_sl,
-                    close_reason="Stop loss hit"
-                )
-            elif ctx.direction == "sell" and ctx.candle_high >= ctx.current_sl:
-                return TradeUpdateAction(
-                    action_type="close_by_sl",
-                    new_state="ClosedBySl",
-                    close_price=ctx.current_sl,
-                    close_reason="Stop loss hit"
-                )
-            
-            # Check if TP hit
-            if ctx.direction == "buy" and ctx.candle_high >= ctx.current_tp:
-                return TradeUpdateAction(
-                    action_type="close_by_tp",
-                    new_state="ClosedByTp",
-                    close_price=ctx.current_tp,
-                    close_reason="Take profit hit"
-                )
-            elif ctx.direction == "sell" and ctx.candle_low <= ctx.current_tp:
-                return TradeUpdateAction(
-                    action_type="close_by_tp",
-                    new_state="ClosedByTp",
-                    close_price=ctx.current_tp,
-                    close_reason="Take profit hit"
-                )
+            hit_action = self._check_sl_tp_hit(ctx)
+            if hit_action:
+                return hit_action
             
             # Check for SL/TP adjustments using estimator
-            from app.core.sl_tp.sl_tp_estimator import OpenTradeAnalytics
-            from datetime import datetime
-            
-            analytics = OpenTradeAnalytics(
-                trade_id=ctx.trade_id,
-                symbol_alias=ctx.symbol_alias,
-                direction=ctx.direction,
-                entry_price=ctx.entry_price,
-                current_price=ctx.current_price,
-                current_sl=ctx.current_sl,
-                current_tp=ctx.current_tp,
-                open_duration=timedelta(hours=1),  # Simplified
-                current_rr=0,  # Simplified
-                h4_df=ctx.mtf_context.h4,
-                h1_df=ctx.mtf_context.h1
+            adjustment = await self.sl_tp_estimator.evaluate_adjustment(
+                self._build_trade_analytics(ctx)
             )
-            
-            adjustment = await self.sl_tp_estimator.evaluate_adjustment(analytics)
-            
-            if adjustment:
-                return TradeUpdateAction(
-                    action_type="update_sl_tp" if adjustment.action != "close_early" else "close_manual",
-                    new_sl=adjustment.new_sl,
-                    new_tp=adjustment.new_tp,
-                    new_state="ClosedManual" if adjustment.action == "close_early" else None,
-                    close_reason=adjustment.reason if adjustment.action == "close_early" else None
-                )
-            
-            return None
+            return self._adjustment_to_action(adjustment)
         
         except Exception as e:
             logger.error(f"Error evaluating trade {ctx.trade_id}: {e}", exc_info=True)
             return None
+    
+    def _check_sl_tp_hit(self, ctx: TradeContext) -> Optional[TradeUpdateAction]:
+        """
+        Check whether the latest candle hit the trade's SL or TP.
+        
+        Args:
+            ctx: Trade context
+        
+        Returns:
+            Close action if SL or TP was hit, None otherwise
+        """
+        # Check if SL hit
+        if ctx.direction == "buy" and ctx.candle_low <= ctx.current_sl:
+            return TradeUpdateAction(
+                action_type="close_by_sl",
+                new_state="ClosedBySl",
+                close_price=ctx.current_sl,
+                close_reason="Stop loss hit"
+            )
+        elif ctx.direction == "sell" and ctx.candle_high >= ctx.current_sl:
+            return TradeUpdateAction(
+                action_type="close_by_sl",
+                new_state="ClosedBySl",
+                close_price=ctx.current_sl,
+                close_reason="Stop loss hit"
+            )
+        
+        # Check if TP hit
+        if ctx.direction == "buy" and ctx.candle_high >= ctx.current_tp:
+            return TradeUpdateAction(
+                action_type="close_by_tp",
+                new_state="ClosedByTp",
+                close_price=ctx.current_tp,
+                close_reason="Take profit hit"
+            )
+        elif ctx.direction == "sell" and ctx.candle_low <= ctx.current_tp:
+            return TradeUpdateAction(
+                action_type="close_by_tp",
+                new_state="ClosedByTp",
+                close_price=ctx.current_tp,
+                close_reason="Take profit hit"
+            )
+        
+        return None
+    
+    def _build_trade_analytics(self, ctx: TradeContext) -> OpenTradeAnalytics:
+        """
+        Build estimator input for an open trade.
+        
+        Args:
+            ctx: Trade context
+        
+        Returns:
+            OpenTradeAnalytics for the trade
+        """
+        return OpenTradeAnalytics(
+            trade_id=ctx.trade_id,
+            symbol_alias=ctx.symbol_alias,
+            direction=ctx.direction,
+            entry_price=ctx.entry_price,
+            current_price=ctx.current_price,
+            current_sl=ctx.current_sl,
+            current_tp=ctx.current_tp,
+            open_duration=_ONE_HOUR,  # Simplified
+            current_rr=0,  # Simplified
+            h4_df=ctx.mtf_context.h4,
+            h1_df=ctx.mtf_context.h1
+        )
+    
+    def _adjustment_to_action(
+        self,
+        adjustment: Optional[SlTpAdjustment]
+    ) -> Optional[TradeUpdateAction]:
+        """
+        Convert an estimator adjustment into a trade update action.
+        
+        Args:
+            adjustment: Recommended adjustment, if any
+        
+        Returns:
+            TradeUpdateAction if an adjustment was recommended, None otherwise
+        """
+        if not adjustment:
+            return None
+        
+        return TradeUpdateAction(
+            action_type="update_sl_tp" if adjustment.action != "close_early" else "close_manual",
+            new_sl=adjustment.new_sl,
+            new_tp=adjustment.new_tp,
+            new_state="ClosedManual" if adjustment.action == "close_early" else None,
+            close_reason=adjustment.reason if adjustment.action == "close_early" else None
+        )
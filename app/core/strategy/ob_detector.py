@@ -1,11 +1,100 @@
 """Order Block (OB) detector"""
+import numpy as np
 import pandas as pd
-from typing import List, Dict
+from dataclasses import dataclass
+from typing import List, Dict, Tuple
 import logging
 
+from app.core.strategy.ohlc_cache import OHLCCache
+from app.core.strategy.technical_utils import DIRECTION_BEARISH, DIRECTION_BULLISH
+
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class OBRecords:
+    """
+    Detected Order Blocks stored as parallel arrays (one element per OB).
+    
+    Attributes:
+        start_idx: Start index
+        end_idx: End index
+        ob_high: Upper bound of OB
+        ob_low: Lower bound of OB
+        direction_code: DIRECTION_BULLISH or DIRECTION_BEARISH (uint8)
+        timestamps: Timestamp of the OB candle
+    """
+    start_idx: np.ndarray
+    end_idx: np.ndarray
+    ob_high: np.ndarray
+    ob_low: np.ndarray
+    direction_code: np.ndarray
+    timestamps: pd.Index
+    
+    def __len__(self) -> int:
+        return len(self.direction_code)
+    
+    def to_dicts(self) -> List[Dict]:
+        """Convert to the list-of-dicts format returned by detect_order_blocks"""
+        return [
+            {
+                'start_idx': start_idx,
+                'end_idx': end_idx,
+                'ob_high': self.ob_high[k],
+                'ob_low': self.ob_low[k],
+                'direction': 'bullish' if self.direction_code[k] == DIRECTION_BULLISH else 'bearish',
+                'direction_code': self.direction_code[k],
+                'timestamp': self.timestamps[k]
+            }
+            for k, (start_idx, end_idx) in enumerate(
+                zip(self.start_idx.tolist(), self.end_idx.tolist())
+            )
+        ]
+
+
+def _detect_ob_core(
+    o: np.ndarray,
+    c: np.ndarray,
+    threshold: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Numeric core of Order Block detection on plain arrays.
+    
+    Only the open/close arrays are read; the caller looks up highs, lows
+    and timestamps for the returned indices.
+    
+    Args:
+        o: Open prices
+        c: Close prices
+        threshold: Minimum move size (as fraction) to consider "strong"
+    
+    Returns:
+        Tuple of (candle indices, direction codes as uint8)
+    """
+    # Candle i is compared with the close two candles later (i + 2);
+    # fewer than 5 candles leave these slices empty
+    curr_open = o[2:-2]
+    curr_close = c[2:-2]
+    move = c[4:] - curr_close
+    
+    # |move| / close > threshold, squared to avoid the division. A negative
+    # close makes the ratio negative, so it never counts as strong.
+    limit = threshold * curr_close
+    strong = (move * move > limit * limit) & (curr_close >= 0)
+    
+    # Bullish OB: down candle followed by strong up move
+    bull_mask = (curr_close < curr_open) & (move > 0) & strong
+    # Bearish OB: up candle followed by strong down move
+    bear_mask = (curr_close > curr_open) & (move < 0) & strong
+    
+    found = np.flatnonzero(bull_mask | bear_mask)
+    direction_code = np.where(
+        bull_mask[found], DIRECTION_BULLISH, DIRECTION_BEARISH
+    ).astype(np.uint8)
+    
+    return found + 2, direction_code
+
+
 class IOrderBlockDetector:
     """
     Detects Order Blocks in OHLC data.
@@ -34,53 +123,48 @@ class IOrderBlockDetector:
             - ob_high: Upper bound of OB
             - ob_low: Lower bound of OB
             - direction: "bullish" or "bearish"
+            - direction_code: DIRECTION_BULLISH or DIRECTION_BEARISH (uint8)
+        """
+        return self.detect_order_blocks_from_arrays(
+            OHLCCache.build(df),
+            lookback=lookback,
+            threshold=threshold
+        ).to_dicts()
+    
+    def detect_order_blocks_from_arrays(
+        self,
+        cache: OHLCCache,
+        lookback: int = 50,
+        threshold: float = 0.02
+    ) -> OBRecords:
         """
-        if len(df) < 5:
-            return []
+        Detect Order Blocks from cached OHLC arrays.
         
-        obs = []
+        Args:
+            cache: OHLC arrays of the timeframe
+            lookback: Number of recent candles to analyze
+            threshold: Minimum move size (as fraction) to consider "strong"
         
+        Returns:
+            OBRecords with one element per detected OB
+        """
         # Analyze recent candles
-        recent_df = df.tail(lookback) if len(df) > lookback else df
+        o = cache.o[-lookback:]
+        h = cache.h[-lookback:]
+        l = cache.l[-lookback:]
+        c = cache.c[-lookback:]
+        index = cache.index[-lookback:]
+        
+        ob_idx, direction_code = _detect_ob_core(o, c, threshold)
         
-        for i in range(2, len(recent_df) - 2):
-            prev_candle = recent_df.iloc[i - 1]
-            curr_candle = recent_df.iloc[i]
-            next_candle = recent_df.iloc[i + 1]
-            next2_candle = recent_df.iloc[i + 2]
-            
-            # Calculate move size
-            curr_close = curr_candle['close']
-            next2_close = next2_candle['close']
-            move_size = abs(next2_close - curr_close) / curr_close
-            
-            # Bullish OB: down candle followed by strong up move
-            if (curr_candle['close'] < curr_candle['open'] and
-                next2_close > curr_close and
-                move_size > threshold):
-                
-                obs.append({
-                    'start_idx': i,
-                    'end_idx': i,
-                    'ob_high': curr_candle['high'],
-                    'ob_low': curr_candle['low'],
-                    'direction': 'bullish',
-                    'timestamp': recent_df.index[i]
-                })
-            
-            # Bearish OB: up candle followed by strong down move
-            elif (curr_candle['close'] > curr_candle['open'] and
-                  next2_close < curr_close and
-                  move_size > threshold):
-                
-                obs.append({
-                    'start_idx': i,
-                    'end_idx': i,
-                    'ob_high': curr_candle['high'],
-                    'ob_low': curr_candle['low'],
-                    'direction': 'bearish',
-                    'timestamp': recent_df.index[i]
-                })
+        obs = OBRecords(
+            start_idx=ob_idx,
+            end_idx=ob_idx,
+            ob_high=h[ob_idx],
+            ob_low=l[ob_idx],
+            direction_code=direction_code,
+            timestamps=index[ob_idx]
+        )
         
-        logger.debug(f"Detected {len(obs)} Order Blocks in {len(recent_df)} candles")
+        logger.debug(f"Detected {len(obs)} Order Blocks in {len(c)} candles")
         return obs
@@ -0,0 +1,69 @@
+"""Columnar OHLC cache shared by strategy detectors"""
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class OHLCCache:
+    """
+    OHLC columns of one timeframe extracted once as contiguous arrays.
+    
+    Built once per evaluation and passed to every detector so the same
+    DataFrame columns are not looked up and re-materialized repeatedly.
+    
+    Attributes:
+        o: Open prices
+        h: High prices
+        l: Low prices
+        c: Close prices
+        index: Candle timestamps
+        last_ts: Last candle timestamp as int64 nanoseconds since epoch,
+            None if there are no candles
+    """
+    o: np.ndarray
+    h: np.ndarray
+    l: np.ndarray
+    c: np.ndarray
+    index: pd.Index
+    last_ts: Optional[int] = None
+    
+    @classmethod
+    def build(cls, df: pd.DataFrame, dtype: Optional[np.dtype] = None) -> "OHLCCache":
+        """
+        Extract OHLC arrays from a DataFrame.
+        
+        Args:
+            df: DataFrame with OHLC data
+            dtype: Price dtype of the arrays (default: keep the column dtype).
+                np.float32 halves the memory traffic of detector scans, which
+                only compare prices against each other and coarse thresholds.
+        
+        Returns:
+            OHLCCache for the DataFrame
+        """
+        index = df.index
+        
+        return cls(
+            o=df['open'].to_numpy(dtype=dtype, copy=False),
+            h=df['high'].to_numpy(dtype=dtype, copy=False),
+            l=df['low'].to_numpy(dtype=dtype, copy=False),
+            c=df['close'].to_numpy(dtype=dtype, copy=False),
+            index=index,
+            last_ts=int(index.asi8[-1]) if len(index) else None
+        )
+    
+    def __len__(self) -> int:
+        return len(self.c)
+    
+    @cached_property
+    def body_sign(self) -> np.ndarray:
+        """
+        Candle body direction: 1 for close > open, -1 for close < open, else 0.
+        
+        Computed on first use and shared by every check that counts up/down
+        candles on this timeframe.
+        """
+        return (self.c > self.o).astype(np.int8) - (self.c < self.o).astype(np.int8)
@@ -1,11 +1,18 @@
 """Technical analysis utilities"""
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import List, Tuple
 import logging
 
+from app.core.strategy.ohlc_cache import OHLCCache
+
 logger = logging.getLogger(__name__)
 
+# Numeric direction codes emitted alongside the "bullish"/"bearish" strings
+DIRECTION_BEARISH = 0
+DIRECTION_BULLISH = 1
+
 
 def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     """
@@ -18,16 +25,18 @@ def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     Returns:
         Series with ATR values
     """
-    high = df['high']
-    low = df['low']
-    close = df['close']
+    high = df['high'].to_numpy()
+    low = df['low'].to_numpy()
+    close = df['close'].to_numpy()
     
-    # True Range
-    tr1 = high - low
-    tr2 = abs(high - close.shift())
-    tr3 = abs(low - close.shift())
+    # Previous close (undefined for the first candle)
+    prev_close = np.empty_like(close, dtype=np.float64)
+    prev_close[:1] = np.nan
+    prev_close[1:] = close[:-1]
     
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    # True Range (fmax skips the undefined previous close on the first candle)
+    tr = np.fmax.reduce([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    tr = pd.Series(tr, index=df.index)
     
     # ATR is EMA of TR
     atr = tr.ewm(span=period, adjust=False).mean()
@@ -46,25 +55,38 @@ def identify_swing_points(df: pd.DataFrame, window: int = 5) -> Tuple[List[float
     Returns:
         Tuple of (swing_highs, swing_lows)
     """
-    swing_highs = []
-    swing_lows = []
+    return identify_swing_points_from_arrays(OHLCCache.build(df), window=window)
+
+
+def identify_swing_points_from_arrays(cache: OHLCCache, window: int = 5) -> Tuple[List[float], List[float]]:
+    """
+    Identify swing highs and lows from cached OHLC arrays.
+    
+    Args:
+        cache: OHLC arrays of the timeframe
+        window: Window size for swing detection
+    
+    Returns:
+        Tuple of (swing_highs, swing_lows)
+    """
+    if len(cache) < window * 2 + 1:
+        return [], []
     
-    if len(df) < window * 2 + 1:
-        return swing_highs, swing_lows
+    highs = cache.h
+    lows = cache.l
     
-    highs = df['high'].values
-    lows = df['low'].values
+    # Rolling max/min over every centred window of 2 * window + 1 candles
+    size = window * 2 + 1
+    window_highs = sliding_window_view(highs, size).max(axis=1)
+    window_lows = sliding_window_view(lows, size).min(axis=1)
     
-    for i in range(window, len(df) - window):
-        # Swing high: highest in window
-        if highs[i] == max(highs[i-window:i+window+1]):
-            swing_highs.append(highs[i])
-        
-        # Swing low: lowest in window
-        if lows[i] == min(lows[i-window:i+window+1]):
-            swing_lows.append(lows[i])
+    # Swing high/low: candle is the extreme of its own window
+    centre_highs = highs[window:len(highs) - window]
+    centre_lows = lows[window:len(lows) - window]
+    swing_highs = centre_highs[centre_highs == window_highs]
+    swing_lows = centre_lows[centre_lows == window_lows]
     
-    return swing_highs, swing_lows
+    return swing_highs.tolist(), swing_lows.tolist()
 
 
 def detect_bos(df: pd.DataFrame, lookback: int = 20) -> List[dict]:
@@ -77,35 +99,45 @@ def detect_bos(df: pd.DataFrame, lookback: int = 20) -> List[dict]:
         df: DataFrame with OHLC data
         lookback: Lookback period for structure
     
+    Returns:
+        List of BOS events
+    """
+    return detect_bos_from_arrays(OHLCCache.build(df), lookback=lookback)
+
+
+def detect_bos_from_arrays(cache: OHLCCache, lookback: int = 20) -> List[dict]:
+    """
+    Detect Break of Structure (BOS) from cached OHLC arrays.
+    
+    Args:
+        cache: OHLC arrays of the timeframe
+        lookback: Lookback period for structure
+    
     Returns:
         List of BOS events
     """
     bos_events = []
     
-    if len(df) < lookback + 5:
+    if len(cache) < lookback + 5:
         return bos_events
     
-    recent_df = df.tail(lookback)
-    
     # Find recent high and low
-    recent_high = recent_df['high'].max()
-    recent_low = recent_df['low'].min()
+    recent_high = cache.h[-lookback:].max()
+    recent_low = cache.l[-lookback:].min()
     
     # Check if latest candle breaks structure
-    latest = df.iloc[-1]
-    
-    if latest['high'] > recent_high:
+    if cache.h[-1] > recent_high:
         bos_events.append({
             'type': 'bullish_bos',
-            'price': latest['high'],
-            'timestamp': df.index[-1]
+            'price': cache.h[-1],
+            'timestamp': cache.index[-1]
         })
     
-    if latest['low'] < recent_low:
+    if cache.l[-1] < recent_low:
         bos_events.append({
             'type': 'bearish_bos',
-            'price': latest['low'],
-            'timestamp': df.index[-1]
+            'price': cache.l[-1],
+            'timestamp': cache.index[-1]
         })
     
     return bos_events
@@ -121,39 +153,54 @@ def detect_choch(df: pd.DataFrame, lookback: int = 20) -> List[dict]:
         df: DataFrame with OHLC data
         lookback: Lookback period
     
+    Returns:
+        List of CHOCH events
+    """
+    return detect_choch_from_arrays(OHLCCache.build(df), lookback=lookback)
+
+
+def detect_choch_from_arrays(cache: OHLCCache, lookback: int = 20) -> List[dict]:
+    """
+    Detect Change of Character (CHOCH) from cached OHLC arrays.
+    
+    Args:
+        cache: OHLC arrays of the timeframe
+        lookback: Lookback period
+    
     Returns:
         List of CHOCH events
     """
     choch_events = []
     
-    if len(df) < lookback + 10:
+    if len(cache) < lookback + 10:
         return choch_events
     
     # Simplified CHOCH detection:
     # Look for trend change in recent candles
-    recent_df = df.tail(lookback)
+    sign = cache.body_sign
     
     # Calculate simple trend (more ups vs downs)
-    ups = (recent_df['close'] > recent_df['open']).sum()
-    downs = (recent_df['close'] < recent_df['open']).sum()
+    recent_sign = sign[-lookback:]
+    ups = (recent_sign > 0).sum()
+    downs = (recent_sign < 0).sum()
     
     # Check last few candles for reversal
-    last_5 = df.tail(5)
-    recent_ups = (last_5['close'] > last_5['open']).sum()
-    recent_downs = (last_5['close'] < last_5['open']).sum()
+    last_sign = sign[-5:]
+    recent_ups = (last_sign > 0).sum()
+    recent_downs = (last_sign < 0).sum()
     
     # CHOCH: trend was up, now turning down
     if ups > downs * 1.5 and recent_downs > recent_ups:
         choch_events.append({
             'type': 'bearish_choch',
-            'timestamp': df.index[-1]
+            'timestamp': cache.index[-1]
         })
     
     # CHOCH: trend was down, now turning up
     if downs > ups * 1.5 and recent_ups > recent_downs:
         choch_events.append({
             'type': 'bullish_choch',
-            'timestamp': df.index[-1]
+            'timestamp': cache.index[-1]
         })
     
     return choch_events
@@ -169,39 +216,124 @@ def detect_liquidity_sweep(df: pd.DataFrame, lookback: int = 20) -> List[dict]:
         df: DataFrame with OHLC data
         lookback: Lookback period
     
+    Returns:
+        List of liquidity sweep events
+    """
+    return detect_liquidity_sweep_from_arrays(OHLCCache.build(df), lookback=lookback)
+
+
+def detect_liquidity_sweep_from_arrays(cache: OHLCCache, lookback: int = 20) -> List[dict]:
+    """
+    Detect liquidity sweeps from cached OHLC arrays.
+    
+    Args:
+        cache: OHLC arrays of the timeframe
+        lookback: Lookback period
+    
     Returns:
         List of liquidity sweep events
     """
     sweeps = []
     
-    if len(df) < lookback + 3:
+    if len(cache) < lookback + 3:
         return sweeps
     
-    recent_df = df.tail(lookback)
-    
     # Find recent high and low
-    recent_high = recent_df['high'].max()
-    recent_low = recent_df['low'].min()
+    recent_high = cache.h[-lookback:].max()
+    recent_low = cache.l[-lookback:].min()
     
     # Check last 3 candles for sweep pattern
-    last_3 = df.tail(3)
-    
     # Bullish sweep: wick below recent low, then close above
-    if (last_3.iloc[0]['low'] < recent_low and
-        last_3.iloc[-1]['close'] > last_3.iloc[0]['open']):
+    if cache.l[-3] < recent_low and cache.c[-1] > cache.o[-3]:
         sweeps.append({
             'type': 'bullish_sweep',
-            'price': last_3.iloc[0]['low'],
-            'timestamp': df.index[-1]
+            'price': cache.l[-3],
+            'timestamp': cache.index[-1]
         })
     
     # Bearish sweep: wick above recent high, then close below
-    if (last_3.iloc[0]['high'] > recent_high and
-        last_3.iloc[-1]['close'] < last_3.iloc[0]['open']):
+    if cache.h[-3] > recent_high and cache.c[-1] < cache.o[-3]:
         sweeps.append({
             'type': 'bearish_sweep',
-            'price': last_3.iloc[0]['high'],
-            'timestamp': df.index[-1]
+            'price': cache.h[-3],
+            'timestamp': cache.index[-1]
         })
     
     return sweeps
+
+
+def has_bos(cache: OHLCCache, bullish: bool, lookback: int = 20) -> bool:
+    """
+    Check for a Break of Structure in one direction without building events.
+    
+    Args:
+        cache: OHLC arrays of the timeframe
+        bullish: True for a bullish BOS, False for a bearish one
+        lookback: Lookback period for structure
+    
+    Returns:
+        True if detect_bos_from_arrays would report a BOS of that direction
+    """
+    if len(cache) < lookback + 5:
+        return False
+    
+    if bullish:
+        return bool(cache.h[-1] > cache.h[-lookback:].max())
+    return bool(cache.l[-1] < cache.l[-lookback:].min())
+
+
+def has_choch(cache: OHLCCache, bullish: bool, lookback: int = 20) -> bool:
+    """
+    Check for a Change of Character in one direction without building events.
+    
+    Args:
+        cache: OHLC arrays of the timeframe
+        bullish: True for a bullish CHOCH, False for a bearish one
+        lookback: Lookback period
+    
+    Returns:
+        True if detect_choch_from_arrays would report a CHOCH of that direction
+    """
+    if len(cache) < lookback + 10:
+        return False
+    
+    sign = cache.body_sign
+    recent_sign = sign[-lookback:]
+    ups = (recent_sign > 0).sum()
+    downs = (recent_sign < 0).sum()
+    
+    last_sign = sign[-5:]
+    recent_ups = (last_sign > 0).sum()
+    recent_downs = (last_sign < 0).sum()
+    
+    if bullish:
+        return bool(downs > ups * 1.5 and recent_ups > recent_downs)
+    return bool(ups > downs * 1.5 and recent_downs > recent_ups)
+
+
+def has_liquidity_sweep(cache: OHLCCache, bullish: bool, lookback: int = 20) -> bool:
+    """
+    Check for a liquidity sweep in one direction without building events.
+    
+    Args:
+        cache: OHLC arrays of the timeframe
+        bullish: True for a bullish sweep, False for a bearish one
+        lookback: Lookback period
+    
+    Returns:
+        True if detect_liquidity_sweep_from_arrays would report a sweep of
+        that direction
+    """
+    if len(cache) < lookback + 3:
+        return False
+    
+    # Close test first: it is O(1) and skips the window reduction when it fails
+    if bullish:
+        return bool(
+            cache.c[-1] > cache.o[-3]
+            and cache.l[-3] < cache.l[-lookback:].min()
+        )
+    return bool(
+        cache.c[-1] < cache.o[-3]
+        and cache.h[-3] > cache.h[-lookback:].max()
+    )
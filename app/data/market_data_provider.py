@@ -1,5 +1,5 @@
 """Market data provider protocol"""
-from typing import Protocol
+from typing import Dict, List, Protocol
 from datetime import datetime, timedelta
 import pandas as pd
 
@@ -11,7 +11,8 @@ class MarketDataProvider(Protocol):
         self,
         symbol: str,
         interval: str,  # "1m", "5m", "15m", "30m", "60m", "240m"
-        lookback: timedelta
+        lookback: timedelta,
+        copy: bool = False
     ) -> pd.DataFrame:
         """
         Fetch OHLC candles for a symbol and interval.
@@ -20,12 +21,36 @@ class MarketDataProvider(Protocol):
             symbol: yfinance symbol (e.g., "^DJI", "XAUUSD=X")
             interval: Timeframe interval
             lookback: How far back to fetch data
+            copy: Return a copy that the caller may modify. Without it the
+                result may be shared with the provider and must be treated
+                as read-only.
         
         Returns:
             DataFrame with columns: timestamp, open, high, low, close, volume
         """
         ...
     
+    async def get_candles_batch(
+        self,
+        symbols: List[str],
+        interval: str,
+        lookback: timedelta,
+        copy: bool = False
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch OHLC candles for several symbols of one interval.
+        
+        Args:
+            symbols: yfinance symbols
+            interval: Timeframe interval
+            lookback: How far back to fetch data
+            copy: Return copies that the caller may modify
+        
+        Returns:
+            Dictionary of symbol -> DataFrame (symbols without data omitted)
+        """
+        ...
+    
     async def validate_symbol(self, symbol: str) -> bool:
         """
         Validate that a symbol is available from the data provider.
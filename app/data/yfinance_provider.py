@@ -1,15 +1,134 @@
 """yfinance market data provider implementation"""
 import logging
 import asyncio
-from typing import Dict, Tuple
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
+import requests
 import yfinance as yf
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from requests.adapters import HTTPAdapter
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+    wait_exponential_jitter,
+)
+
+try:
+    from yfinance.exceptions import YFRateLimitError
+except ImportError:  # yfinance < 0.2.51 has no dedicated rate limit error
+    YFRateLimitError = None
 
 logger = logging.getLogger(__name__)
 
 
+def _create_session() -> requests.Session:
+    """
+    Create the HTTP session shared by all yfinance requests.
+    
+    Reusing one session keeps connections (TCP + TLS) to Yahoo alive
+    between calls instead of handshaking for every ticker.
+    
+    Returns:
+        Session with a pooled adapter and browser User-Agent
+    """
+    session = requests.Session()
+    
+    # Add user-agent to bypass bot detection
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    })
+    
+    # Retries are handled by tenacity around the provider methods
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    
+    return session
+
+
+_SESSION = _create_session()
+
+# yf.download gathers results and errors in module-global dicts
+# (yfinance.shared), so overlapping downloads can mix each other's frames.
+# Held in the worker thread around every yf.download call.
+_DOWNLOAD_LOCK = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Get the HTTP session shared by all yfinance requests.
+    
+    Returned so callers can customize it (headers, adapters, proxies).
+    
+    Returns:
+        Shared requests.Session
+    """
+    return _SESSION
+
+
+def _make_read_only(df: pd.DataFrame) -> None:
+    """
+    Mark the arrays backing a DataFrame as read-only.
+    
+    Cached frames are handed out without copying, so in-place writes by a
+    caller would silently corrupt the cache; this makes them raise instead.
+    
+    Args:
+        df: DataFrame to protect
+    """
+    for block in df._mgr.blocks:
+        block.values.flags.writeable = False
+
+
+def _is_transient_error(error: BaseException) -> bool:
+    """
+    Check whether a failed yfinance request is worth retrying.
+    
+    Args:
+        error: Exception raised by the request
+    
+    Returns:
+        True for connection errors, timeouts and rate limiting (HTTP 429)
+    """
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    if YFRateLimitError is not None and isinstance(error, YFRateLimitError):
+        return True
+    
+    # Older yfinance versions surface rate limiting only in the message
+    message = str(error)
+    return "Too Many Requests" in message or "Rate limited" in message
+
+
+def _download(**kwargs) -> pd.DataFrame:
+    """
+    Call yf.download, one call at a time across the process.
+    
+    Args:
+        **kwargs: Arguments for yf.download
+    
+    Returns:
+        DataFrame returned by yf.download
+    """
+    with _DOWNLOAD_LOCK:
+        return yf.download(**kwargs)
+
+
+def _safe_symbol(symbol: str) -> str:
+    """Make a yfinance symbol usable as part of a file name"""
+    return re.sub(r'[^\w.=^-]', '_', symbol)
+
+
 class YFinanceMarketDataProvider:
     """
     Market data provider using yfinance library.
@@ -40,23 +159,81 @@ class YFinanceMarketDataProvider:
         "240m": timedelta(days=730),
     }
     
-    def __init__(self):
-        """Initialize provider with empty cache"""
-        # Cache: (symbol, interval) -> DataFrame
-        self._cache: Dict[Tuple[str, str], pd.DataFrame] = {}
+    # Compact column dtypes applied at ingest (see compact_dtypes)
+    PRICE_DTYPE = np.float32
+    VOLUME_DTYPE = np.uint32
+    
+    # How long symbol validation results are reused (seconds). Failures
+    # expire quickly so a transient error does not mark a symbol invalid.
+    VALID_SYMBOL_TTL = 3600.0
+    INVALID_SYMBOL_TTL = 60.0
+    
+    # Maximum yfinance requests in flight across all symbols
+    MAX_CONCURRENT_REQUESTS = 4
+    
+    # Headroom over the lookback window before a cache entry is trimmed,
+    # so trimming (which copies the frame) happens once per 10% growth
+    TRIM_SLACK = 1.1
+    
+    def __init__(
+        self,
+        compact_dtypes: bool = False,
+        cache_dir: Optional[Path] = None,
+        max_cache_entries: int = 64
+    ):
+        """
+        Initialize provider with empty cache.
+        
+        Args:
+            compact_dtypes: Store prices as float32 and volume as uint32,
+                halving cache memory. Off by default because swing points,
+                SL/TP and entry prices are read from the cached frames, and
+                float32 keeps only about 7 significant digits (visible on
+                5-decimal FX quotes).
+            cache_dir: Directory for persisting the candle cache as Parquet
+                files, so a restart only fetches candles newer than the
+                files (None keeps the cache in memory only)
+            max_cache_entries: Maximum number of (symbol, interval) entries
+                kept in memory; the least recently used entry is evicted
+        """
+        self.compact_dtypes = compact_dtypes
+        self.max_cache_entries = max_cache_entries
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Limits concurrent yfinance requests to stay clear of rate limits
+        self._request_slots = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        
+        # Ticker objects reused across requests: symbol -> Ticker
+        self._tickers: Dict[str, yf.Ticker] = {}
+        
+        # Symbol validation results: symbol -> (valid, monotonic check time)
+        self._valid_cache: Dict[str, Tuple[bool, float]] = {}
+        
+        # Background Parquet writes: latest frame waiting to be written and
+        # the single writer task per (symbol, interval)
+        self._queued_writes: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self._write_tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+        
+        # Cache: (symbol, interval) -> DataFrame, ordered by last use
+        self._cache: OrderedDict[Tuple[str, str], pd.DataFrame] = OrderedDict()
+        # Last cached candle timestamp: (symbol, interval) -> Timestamp
+        self._last_ts: Dict[Tuple[str, str], pd.Timestamp] = {}
         # Last fetch timestamp: (symbol, interval) -> datetime
         self._last_fetch: Dict[Tuple[str, str], datetime] = {}
     
     @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((ConnectionError, TimeoutError))
+        stop=stop_after_attempt(5),
+        wait=wait_exponential_jitter(initial=2, max=60),
+        retry=retry_if_exception(_is_transient_error)
     )
     async def get_candles(
         self,
         symbol: str,
         interval: str,
-        lookback: timedelta
+        lookback: timedelta,
+        copy: bool = False
     ) -> pd.DataFrame:
         """
         Fetch OHLC candles with intelligent caching.
@@ -68,30 +245,26 @@ class YFinanceMarketDataProvider:
             symbol: yfinance symbol
             interval: Timeframe interval
             lookback: How far back to fetch data
+            copy: Return a private copy. By default the cached DataFrame is
+                returned as-is; its arrays are read-only, so callers that
+                modify the data in place must pass copy=True.
         
         Returns:
             DataFrame with columns: timestamp, open, high, low, close, volume
         """
-        cache_key = (symbol, interval)
+        cache_key = (sys.intern(symbol), sys.intern(interval))
+        yf_interval, lookback = self._resolve_interval(interval, lookback)
         
-        # Map interval to yfinance format
-        yf_interval = self.INTERVAL_MAP.get(interval)
-        if not yf_interval:
-            raise ValueError(f"Unsupported interval: {interval}")
-        
-        # Respect yfinance limitations
-        max_lookback = self.MAX_LOOKBACK.get(interval, timedelta(days=730))
-        if lookback > max_lookback:
-            logger.warning(
-                f"Lookback {lookback} exceeds max {max_lookback} for {interval}. "
-                f"Using max lookback."
-            )
-            lookback = max_lookback
+        # Warm start from a persisted cache file
+        if cache_key not in self._cache and self.cache_dir is not None:
+            await self._load_from_disk(cache_key, lookback)
         
         # Check if we have cached data
         if cache_key in self._cache:
+            self._cache.move_to_end(cache_key)
+            
             # Fetch only new candles since last fetch
-            last_timestamp = self._cache[cache_key].index[-1]
+            last_timestamp = self._last_ts[cache_key]
             new_data = await self._fetch_yfinance(
                 symbol,
                 yf_interval,
@@ -99,19 +272,39 @@ class YFinanceMarketDataProvider:
                 end=None
             )
             
+            self._last_fetch[cache_key] = pd.Timestamp.now(tz='UTC')
+            
+            # The fetch starts at the last cached candle, which may have been
+            # incomplete when cached; anything older is already up to date
             if not new_data.empty:
-                # Append new data to cache (avoid duplicates)
-                combined = pd.concat([self._cache[cache_key], new_data])
-                combined = combined[~combined.index.duplicated(keep='last')]
-                combined = combined.sort_index()
-                self._cache[cache_key] = combined
+                new_data = new_data.loc[new_data.index >= last_timestamp]
             
-            self._last_fetch[cache_key] = datetime.utcnow()
-            return self._cache[cache_key].copy()
+            cached = self._cache[cache_key]
+            if new_data.empty:
+                return cached.copy() if copy else cached
+            
+            if new_data.index[0] == last_timestamp:
+                # Replace the cached version of the last candle
+                cached = cached.iloc[:-1]
+            
+            # New candles normally follow the cached ones, so appending them
+            # keeps the cache sorted and free of duplicates. Dedup and sort
+            # only when yfinance returned a repeated or out-of-order bar.
+            cached = pd.concat([cached, new_data], copy=False)
+            if not (cached.index.is_monotonic_increasing and cached.index.is_unique):
+                cached = cached[~cached.index.duplicated(keep='last')].sort_index()
+            _make_read_only(cached)
+            self._cache[cache_key] = cached
+            self._last_ts[cache_key] = new_data.index[-1]
+            
+            cached = self._trim(cache_key, cached, lookback)
+            self._schedule_write(cache_key, cached)
+            
+            return cached.copy() if copy else cached
         
         else:
             # First fetch: get full lookback period
-            start_date = datetime.utcnow() - lookback
+            start_date = pd.Timestamp.now(tz='UTC') - lookback
             data = await self._fetch_yfinance(
                 symbol,
                 yf_interval,
@@ -122,11 +315,294 @@ class YFinanceMarketDataProvider:
             if data.empty:
                 raise ValueError(f"No data returned for {symbol} {interval}")
             
-            # Cache the data
-            self._cache[cache_key] = data
-            self._last_fetch[cache_key] = datetime.utcnow()
+            self._store_initial(cache_key, data)
+            return data.copy() if copy else data
+    
+    async def get_candles_batch(
+        self,
+        symbols: List[str],
+        interval: str,
+        lookback: timedelta,
+        copy: bool = False
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch OHLC candles for several symbols of one interval.
+        
+        Symbols without cached data are downloaded together in a single
+        yf.download call; cached symbols are updated incrementally as in
+        get_candles.
+        
+        Args:
+            symbols: yfinance symbols
+            interval: Timeframe interval
+            lookback: How far back to fetch data
+            copy: Return private copies (see get_candles)
+        
+        Returns:
+            Dictionary of symbol -> DataFrame, in the order of symbols.
+            Symbols for which no data was returned are omitted.
+        """
+        yf_interval, lookback = self._resolve_interval(interval, lookback)
+        interval = sys.intern(interval)
+        symbols = [sys.intern(symbol) for symbol in dict.fromkeys(symbols)]
+        
+        cached_symbols = []
+        missing_symbols = []
+        for symbol in symbols:
+            cache_key = (symbol, interval)
+            if cache_key not in self._cache and self.cache_dir is not None:
+                await self._load_from_disk(cache_key, lookback)
             
-            return data.copy()
+            if cache_key in self._cache:
+                cached_symbols.append(symbol)
+            else:
+                missing_symbols.append(symbol)
+        
+        results: Dict[str, pd.DataFrame] = {}
+        
+        if missing_symbols:
+            # First fetch: one request for the full lookback of all symbols
+            start_date = pd.Timestamp.now(tz='UTC') - lookback
+            downloaded = await self._download_batch(
+                missing_symbols,
+                yf_interval,
+                start=start_date
+            )
+            
+            for symbol in missing_symbols:
+                data = downloaded.get(symbol)
+                if data is None or data.empty:
+                    logger.warning(f"No data returned for {symbol} {interval}")
+                    continue
+                
+                self._store_initial((symbol, interval), data)
+                results[symbol] = data.copy() if copy else data
+        
+        for symbol in cached_symbols:
+            results[symbol] = await self.get_candles(symbol, interval, lookback, copy=copy)
+        
+        return {symbol: results[symbol] for symbol in symbols if symbol in results}
+    
+    def _resolve_interval(self, interval: str, lookback: timedelta) -> Tuple[str, timedelta]:
+        """
+        Map an interval to yfinance format and clamp the lookback.
+        
+        Args:
+            interval: Timeframe interval
+            lookback: Requested lookback period
+        
+        Returns:
+            Tuple of (yfinance interval, lookback within yfinance limits)
+        """
+        # Map interval to yfinance format
+        yf_interval = self.INTERVAL_MAP.get(interval)
+        if not yf_interval:
+            raise ValueError(f"Unsupported interval: {interval}")
+        
+        # Respect yfinance limitations
+        max_lookback = self.MAX_LOOKBACK.get(interval, timedelta(days=730))
+        if lookback > max_lookback:
+            logger.warning(
+                f"Lookback {lookback} exceeds max {max_lookback} for {interval}. "
+                f"Using max lookback."
+            )
+            lookback = max_lookback
+        
+        return yf_interval, lookback
+    
+    def _store_initial(self, cache_key: Tuple[str, str], data: pd.DataFrame) -> None:
+        """
+        Cache the first fetch of a (symbol, interval).
+        
+        Args:
+            cache_key: (symbol, interval) cache key
+            data: Fetched candles (non-empty)
+        """
+        self._insert(cache_key, data)
+        self._last_fetch[cache_key] = pd.Timestamp.now(tz='UTC')
+        self._schedule_write(cache_key, data)
+    
+    def _insert(self, cache_key: Tuple[str, str], data: pd.DataFrame) -> None:
+        """
+        Add a cache entry, evicting least recently used entries over the limit.
+        
+        Args:
+            cache_key: (symbol, interval) cache key
+            data: Candles for the entry (non-empty)
+        """
+        _make_read_only(data)
+        self._cache[cache_key] = data
+        self._cache.move_to_end(cache_key)
+        self._last_ts[cache_key] = data.index[-1]
+        
+        evicted = 0
+        while len(self._cache) > self.max_cache_entries:
+            key, _ = self._cache.popitem(last=False)
+            self._last_ts.pop(key, None)
+            self._last_fetch.pop(key, None)
+            evicted += 1
+        
+        if evicted:
+            logger.info(f"Evicted {evicted} least recently used cache entries")
+    
+    def _trim(
+        self,
+        cache_key: Tuple[str, str],
+        data: pd.DataFrame,
+        lookback: timedelta
+    ) -> pd.DataFrame:
+        """
+        Drop candles older than the lookback window from a cache entry.
+        
+        The window is measured in candles (lookback / interval), an upper
+        bound on the candles inside the lookback period.
+        
+        Args:
+            cache_key: (symbol, interval) cache key
+            data: Cached DataFrame of the entry
+            lookback: Requested lookback period
+        
+        Returns:
+            Cache DataFrame, trimmed if it outgrew the window
+        """
+        max_rows = int(lookback / pd.Timedelta(cache_key[1]))
+        if len(data) <= max_rows * self.TRIM_SLACK:
+            return data
+        
+        # Copy so the dropped candles are actually released
+        data = data.iloc[-max_rows:].copy()
+        _make_read_only(data)
+        self._cache[cache_key] = data
+        return data
+    
+    def _cache_path(self, cache_key: Tuple[str, str]) -> Path:
+        """
+        Get the Parquet file for a cache entry.
+        
+        Args:
+            cache_key: (symbol, interval) cache key
+        
+        Returns:
+            Path of the cache file inside cache_dir
+        """
+        symbol, interval = cache_key
+        return self.cache_dir / f"{_safe_symbol(symbol)}_{interval}.parquet"
+    
+    async def _load_from_disk(self, cache_key: Tuple[str, str], lookback: timedelta) -> None:
+        """
+        Populate a cache entry from its Parquet file, if usable.
+        
+        Files whose last candle is older than the lookback window are
+        ignored so that a long-stopped service refetches from scratch
+        instead of asking yfinance for an out-of-range incremental update.
+        
+        Args:
+            cache_key: (symbol, interval) cache key
+            lookback: Requested lookback period
+        """
+        path = self._cache_path(cache_key)
+        if not path.exists():
+            return
+        
+        try:
+            data = await asyncio.to_thread(pd.read_parquet, path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache file {path}: {e}")
+            return
+        
+        # Another call may have filled the entry while the file was read
+        if data.empty or cache_key in self._cache:
+            return
+        
+        # Files written before indexes were normalized may be naive or in
+        # the exchange timezone
+        data.index = pd.to_datetime(data.index, utc=True)
+        
+        if data.index[-1] < pd.Timestamp.now(tz='UTC') - lookback:
+            logger.info(f"Cache file {path} is stale, fetching full history")
+            return
+        
+        if self.compact_dtypes:
+            data = self._compact(data)
+        
+        self._insert(cache_key, data)
+        logger.info(f"Loaded {len(data)} cached candles from {path}")
+    
+    def _schedule_write(self, cache_key: Tuple[str, str], data: pd.DataFrame) -> None:
+        """
+        Persist a cache entry to disk in a worker thread.
+        
+        Each entry has at most one write in flight. A frame scheduled while
+        a write is running replaces any frame still waiting, so the file
+        always ends up holding the newest frame.
+        
+        Args:
+            cache_key: (symbol, interval) cache key
+            data: Cached DataFrame of the entry
+        """
+        if self.cache_dir is None:
+            return
+        
+        self._queued_writes[cache_key] = data
+        if cache_key not in self._write_tasks:
+            self._write_tasks[cache_key] = asyncio.create_task(self._drain_writes(cache_key))
+    
+    async def _drain_writes(self, cache_key: Tuple[str, str]) -> None:
+        """
+        Write queued frames of a cache entry until none is left.
+        
+        Args:
+            cache_key: (symbol, interval) cache key
+        """
+        path = self._cache_path(cache_key)
+        try:
+            while cache_key in self._queued_writes:
+                data = self._queued_writes.pop(cache_key)
+                await asyncio.to_thread(self._write_to_disk, path, data)
+        finally:
+            del self._write_tasks[cache_key]
+    
+    def _write_to_disk(self, path: Path, data: pd.DataFrame) -> None:
+        """
+        Write a DataFrame to Parquet atomically.
+        
+        Args:
+            path: Destination file
+            data: DataFrame to write
+        """
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{id(data)}.tmp")
+        try:
+            data.to_parquet(tmp_path, compression='zstd', engine='pyarrow')
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write cache file {path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+    
+    def _compact(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Downcast OHLCV columns to PRICE_DTYPE / VOLUME_DTYPE.
+        
+        Volume is only downcast when every value fits, so large volumes
+        (e.g. crypto quoted in USD) keep their original dtype instead of
+        wrapping around.
+        
+        Args:
+            df: DataFrame with OHLCV columns
+        
+        Returns:
+            DataFrame with compact dtypes
+        """
+        dtypes = {col: self.PRICE_DTYPE for col in ('open', 'high', 'low', 'close')}
+        
+        volume = df['volume']
+        if (
+            volume.dtype.kind in 'iu'
+            and volume.min() >= 0
+            and volume.max() <= np.iinfo(self.VOLUME_DTYPE).max
+        ):
+            dtypes['volume'] = self.VOLUME_DTYPE
+        
+        return df.astype(dtypes, copy=False)
     
     async def _fetch_yfinance(
         self,
@@ -147,58 +623,153 @@ class YFinanceMarketDataProvider:
         Returns:
             DataFrame with OHLCV data
         """
-        try:
-            # Add user-agent to bypass bot detection
-            import requests
-            session = requests.Session()
-            session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            })
+        async with self._request_slots:
+            try:
+                ticker = self._get_ticker(symbol)
+                
+                # Fetch history in a worker thread so other symbols progress
+                df = await asyncio.to_thread(
+                    ticker.history,
+                    start=start,
+                    end=end,
+                    interval=interval,
+                    auto_adjust=True,
+                    actions=False
+                )
+                
+                if df.empty:
+                    logger.warning(f"No data returned for {symbol} {interval}")
+                    return pd.DataFrame()
+                
+                df = self._standardize(df)
+                
+                logger.info(
+                    f"Fetched {len(df)} candles for {symbol} {interval} "
+                    f"from {df.index[0]} to {df.index[-1]}"
+                )
+                
+                # Add small delay to avoid rate limiting
+                await asyncio.sleep(0.5)
+                
+                return df
             
-            ticker = yf.Ticker(symbol, session=session)
-            
-            # Fetch history
-            df = ticker.history(
-                start=start,
-                end=end,
-                interval=interval,
-                auto_adjust=True,
-                actions=False
-            )
+            except Exception as e:
+                logger.error(f"Error fetching data for {symbol} {interval}: {e}")
+                raise
+    
+    def _get_ticker(self, symbol: str) -> yf.Ticker:
+        """
+        Get the Ticker for a symbol, creating it on first use.
+        
+        Args:
+            symbol: yfinance symbol
+        
+        Returns:
+            Ticker bound to the shared session
+        """
+        ticker = self._tickers.get(symbol)
+        if ticker is None:
+            ticker = self._tickers[symbol] = yf.Ticker(symbol, session=get_session())
+        return ticker
+    
+    async def _download_batch(
+        self,
+        symbols: List[str],
+        interval: str,
+        start: datetime
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch data for several symbols with a single yf.download call.
+        
+        Downloads are serialized by _DOWNLOAD_LOCK on top of the request
+        semaphore, since concurrent yf.download calls share global state.
+        
+        Args:
+            symbols: yfinance symbols
+            interval: yfinance interval format
+            start: Start datetime
+        
+        Returns:
+            Dictionary of symbol -> standardized DataFrame (symbols without
+            data are omitted)
+        """
+        async with self._request_slots:
+            try:
+                wide = await asyncio.to_thread(
+                    _download,
+                    tickers=' '.join(symbols),
+                    start=start,
+                    interval=interval,
+                    auto_adjust=True,
+                    actions=False,
+                    group_by='ticker',
+                    threads=True,
+                    progress=False,
+                    session=get_session()
+                )
+            except Exception as e:
+                logger.error(f"Error fetching data for {symbols} {interval}: {e}")
+                raise
+        
+        frames = {}
+        for symbol in symbols:
+            if isinstance(wide.columns, pd.MultiIndex):
+                if symbol not in wide.columns.get_level_values(0):
+                    continue
+                df = wide.xs(symbol, axis=1, level=0)
+            else:
+                # Single ticker downloads come back with flat columns
+                df = wide
             
+            # Rows of other symbols' sessions are all-NaN for this symbol
+            df = df.dropna(how='all')
             if df.empty:
-                logger.warning(f"No data returned for {symbol} {interval}")
-                return pd.DataFrame()
-            
-            # Standardize column names
-            df = df.rename(columns={
-                'Open': 'open',
-                'High': 'high',
-                'Low': 'low',
-                'Close': 'close',
-                'Volume': 'volume'
-            })
-            
-            # Keep only OHLCV columns
-            df = df[['open', 'high', 'low', 'close', 'volume']]
+                continue
             
-            # Ensure index is datetime
-            df.index = pd.to_datetime(df.index)
-            df.index.name = 'timestamp'
-            
-            logger.info(
-                f"Fetched {len(df)} candles for {symbol} {interval} "
-                f"from {df.index[0]} to {df.index[-1]}"
-            )
-            
-            # Add small delay to avoid rate limiting
-            await asyncio.sleep(0.5)
-            
-            return df
+            frames[symbol] = self._standardize(df)
         
-        except Exception as e:
-            logger.error(f"Error fetching data for {symbol} {interval}: {e}")
-            raise
+        logger.info(
+            f"Fetched candles for {len(frames)}/{len(symbols)} symbols {interval} "
+            f"in one request"
+        )
+        
+        # Add small delay to avoid rate limiting
+        await asyncio.sleep(0.5)
+        
+        return frames
+    
+    def _standardize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert a yfinance frame to the provider's OHLCV layout.
+        
+        Args:
+            df: DataFrame as returned by yfinance
+        
+        Returns:
+            DataFrame with open/high/low/close/volume columns and a UTC
+            datetime index named 'timestamp'
+        """
+        # Standardize column names
+        df = df.rename(columns={
+            'Open': 'open',
+            'High': 'high',
+            'Low': 'low',
+            'Close': 'close',
+            'Volume': 'volume'
+        })
+        
+        # Keep only OHLCV columns
+        df = df[['open', 'high', 'low', 'close', 'volume']]
+        
+        if self.compact_dtypes:
+            df = self._compact(df)
+        
+        # Ensure index is a UTC datetime index, whatever the exchange
+        # timezone, so frames from any source compare as int64
+        df.index = pd.to_datetime(df.index, utc=True)
+        df.index.name = 'timestamp'
+        
+        return df
     
     @retry(
         stop=stop_after_attempt(2),
@@ -208,21 +779,38 @@ class YFinanceMarketDataProvider:
         """
         Validate symbol by attempting to fetch 1 day of data.
         
+        Results are cached for VALID_SYMBOL_TTL (valid) or
+        INVALID_SYMBOL_TTL (invalid) seconds.
+        
         Args:
             symbol: yfinance symbol
         
         Returns:
             True if symbol is valid, False otherwise
         """
+        cached = self._valid_cache.get(symbol)
+        if cached is not None:
+            valid, checked_at = cached
+            ttl = self.VALID_SYMBOL_TTL if valid else self.INVALID_SYMBOL_TTL
+            if time.monotonic() - checked_at < ttl:
+                return valid
+        
+        valid = await asyncio.to_thread(self._check_symbol, symbol)
+        self._valid_cache[symbol] = (valid, time.monotonic())
+        return valid
+    
+    def _check_symbol(self, symbol: str) -> bool:
+        """
+        Fetch 1 day of data for a symbol.
+        
+        Args:
+            symbol: yfinance symbol
+        
+        Returns:
+            True if data was returned, False otherwise
+        """
         try:
-            # Add user-agent to bypass bot detection
-            import requests
-            session = requests.Session()
-            session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            })
-            
-            ticker = yf.Ticker(symbol, session=session)
+            ticker = self._get_ticker(symbol)
             
             # Try to fetch 1 day of data
             df = ticker.history(period="1d", interval="1d")
@@ -248,7 +836,10 @@ class YFinanceMarketDataProvider:
         """
         if symbol is None and interval is None:
             self._cache.clear()
+            self._last_ts.clear()
             self._last_fetch.clear()
+            self._valid_cache.clear()
+            self._tickers.clear()
             logger.info("Cleared all cache")
         else:
             keys_to_remove = [
@@ -258,5 +849,15 @@ class YFinanceMarketDataProvider:
             ]
             for key in keys_to_remove:
                 del self._cache[key]
-                del self._last_fetch[key]
+                del self._last_ts[key]
+                self._last_fetch.pop(key, None)
+            if symbol is not None:
+                self._valid_cache.pop(symbol, None)
+                self._tickers.pop(symbol, None)
             logger.info(f"Cleared cache for {len(keys_to_remove)} entries")
+        
+        # Persisted entries may exist for keys never loaded in this process
+        if self.cache_dir is not None:
+            pattern = f"{_safe_symbol(symbol) if symbol else '*'}_{interval or '*'}.parquet"
+            for path in self.cache_dir.glob(pattern):
+                path.unlink(missing_ok=True)
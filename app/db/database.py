@@ -1,5 +1,5 @@
 """Database connection and session management"""
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
@@ -16,15 +16,19 @@ def init_database(database_url: str) -> None:
     Initialize database engine and session maker.
     
     Args:
-        database_url: PostgreSQL connection URL
+        database_url: PostgreSQL connection URL (SQLite for tests)
     """
     global _engine, _SessionLocal
     
+    engine_kwargs = {}
+    if make_url(database_url).get_backend_name() != "sqlite":
+        # SQLite (used in tests) uses a pool without size limits
+        engine_kwargs.update(pool_size=5, max_overflow=10)
+    
     _engine = create_engine(
         database_url,
         pool_pre_ping=True,  # Verify connections before using
-        pool_size=5,
-        max_overflow=10,
+        **engine_kwargs
     )
     
     _SessionLocal = sessionmaker(
@@ -0,0 +1,48 @@
+"""Trade lookup indexes
+
+Revision ID: 002
+Revises: 001
+Create Date: 2024-01-02 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Latest closed trades per symbol/direction, in close time order
+    op.create_index(
+        'ix_trades_closed_lookup',
+        'trades',
+        ['symbol_alias', 'direction', sa.text('close_time_utc DESC')],
+        unique=False,
+        postgresql_include=['actual_entry_price', 'close_price'],
+        postgresql_where=sa.text("state != 'Open'")
+    )
+    # Open trades per symbol
+    op.create_index(
+        'ix_trades_open',
+        'trades',
+        ['symbol_alias'],
+        unique=False,
+        postgresql_where=sa.text("state = 'Open'")
+    )
+    
+    # Superseded by the partial indexes above
+    op.drop_index(op.f('ix_trades_state'), table_name='trades')
+    op.drop_index(op.f('ix_trades_symbol_alias'), table_name='trades')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_trades_symbol_alias'), 'trades', ['symbol_alias'], unique=False)
+    op.create_index(op.f('ix_trades_state'), 'trades', ['state'], unique=False)
+    
+    op.drop_index('ix_trades_open', table_name='trades')
+    op.drop_index('ix_trades_closed_lookup', table_name='trades')
@@ -2,6 +2,7 @@
 from datetime import datetime
 from sqlalchemy import Column, Integer, String, DateTime, Text
 from app.db.database import Base
+from app.db.types import InternedString
 
 
 class ErrorLog(Base):
@@ -12,11 +13,11 @@ class ErrorLog(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     timestamp_utc = Column(DateTime, nullable=False, index=True)
-    component = Column(String, nullable=False)
-    severity = Column(String, nullable=False)
+    component = Column(InternedString, nullable=False)
+    severity = Column(InternedString, nullable=False)
     message = Column(String, nullable=False)
     exception_type = Column(String, nullable=True)
-    symbol_alias = Column(String, nullable=True, index=True)
+    symbol_alias = Column(InternedString, nullable=True, index=True)
     stack_trace = Column(Text, nullable=True)
     
     def __repr__(self):
@@ -2,6 +2,7 @@
 from datetime import datetime
 from sqlalchemy import Column, Integer, String, DateTime
 from app.db.database import Base
+from app.db.types import InternedString
 
 
 class Heartbeat(Base):
@@ -11,7 +12,7 @@ class Heartbeat(Base):
     __tablename__ = "heartbeats"
     
     id = Column(Integer, primary_key=True, index=True)
-    symbol_alias = Column(String, nullable=False, index=True)
+    symbol_alias = Column(InternedString, nullable=False, index=True)
     timestamp_utc = Column(DateTime, nullable=False, index=True)
     open_trade_count = Column(Integer, nullable=False)
     last_error = Column(String, nullable=True)
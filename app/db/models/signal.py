@@ -3,6 +3,7 @@ from datetime import datetime
 from sqlalchemy import Column, Integer, String, Float, DateTime
 from sqlalchemy.orm import relationship
 from app.db.database import Base
+from app.db.types import InternedString
 
 
 class Signal(Base):
@@ -12,14 +13,14 @@ class Signal(Base):
     __tablename__ = "signals"
     
     id = Column(Integer, primary_key=True, index=True)
-    symbol_alias = Column(String, nullable=False, index=True)
-    yf_symbol = Column(String, nullable=False)
-    direction = Column(String, nullable=False)  # "buy" or "sell"
+    symbol_alias = Column(InternedString, nullable=False, index=True)
+    yf_symbol = Column(InternedString, nullable=False)
+    direction = Column(InternedString, nullable=False)  # "buy" or "sell"
     time_generated_utc = Column(DateTime, nullable=False, index=True)
     entry_price_at_signal = Column(Float, nullable=False)
     initial_sl = Column(Float, nullable=False)
     initial_tp = Column(Float, nullable=False)
-    strategy_name = Column(String, nullable=False)
+    strategy_name = Column(InternedString, nullable=False)
     notes = Column(String, nullable=True)
     estimated_rr = Column(Float, nullable=True)
     
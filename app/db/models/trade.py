@@ -1,9 +1,10 @@
 """Trade database model"""
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, text, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from app.db.database import Base
+from app.db.types import InternedString
 
 
 class TradeState(str, Enum):
@@ -23,14 +24,19 @@ class Trade(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     signal_id = Column(Integer, ForeignKey("signals.id"), nullable=False)
-    symbol_alias = Column(String, nullable=False, index=True)
-    yf_symbol = Column(String, nullable=False)
-    direction = Column(String, nullable=False)  # "buy" or "sell"
+    symbol_alias = Column(InternedString, nullable=False)
+    yf_symbol = Column(InternedString, nullable=False)
+    direction = Column(InternedString, nullable=False)  # "buy" or "sell"
     planned_entry_price = Column(Float, nullable=False)
     actual_entry_price = Column(Float, nullable=False)
     stop_loss = Column(Float, nullable=False)
     take_profit = Column(Float, nullable=False)
-    state = Column(SQLEnum(TradeState), nullable=False, default=TradeState.OPEN, index=True)
+    # Stored by value ("Open", ...) to match the tradestate type of the migrations
+    state = Column(
+        SQLEnum(TradeState, values_callable=lambda states: [state.value for state in states]),
+        nullable=False,
+        default=TradeState.OPEN
+    )
     open_time_utc = Column(DateTime, nullable=False, index=True)
     close_time_utc = Column(DateTime, nullable=True)
     close_price = Column(Float, nullable=True)
@@ -39,5 +45,24 @@ class Trade(Base):
     # Relationship
     signal = relationship("Signal", back_populates="trade")
     
+    __table_args__ = (
+        # Latest closed trades per symbol/direction (get_closed_trades,
+        # get_mae_mfe_stats); includes the prices for index-only scans
+        Index(
+            "ix_trades_closed_lookup",
+            symbol_alias,
+            direction,
+            close_time_utc.desc(),
+            postgresql_include=["actual_entry_price", "close_price"],
+            postgresql_where=text("state != 'Open'"),
+        ),
+        # Open trades per symbol (get_open_trades)
+        Index(
+            "ix_trades_open",
+            symbol_alias,
+            postgresql_where=text("state = 'Open'"),
+        ),
+    )
+    
     def __repr__(self):
         return f"<Trade(id={self.id}, symbol={self.symbol_alias}, state={self.state})>"
@@ -1,14 +1,21 @@
 """Database query utilities"""
+import io
 from datetime import datetime
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy import and_, case, func, insert, select
+from sqlalchemy.sql import Select
 from app.db.models.signal import Signal
 from app.db.models.trade import Trade, TradeState
 from app.db.models.heartbeat import Heartbeat
 from app.db.models.error_log import ErrorLog
 
 
+# Columns written by copy_heartbeats, in COPY order
+_HEARTBEAT_COLUMNS = ["symbol_alias", "timestamp_utc", "open_trade_count", "last_error"]
+
+
 def create_signal(
     db: Session,
     symbol_alias: str,
@@ -23,7 +30,9 @@ def create_signal(
     estimated_rr: Optional[float] = None,
 ) -> Signal:
     """Create a new signal"""
-    signal = Signal(
+    return _insert_returning_id(
+        db,
+        Signal,
         symbol_alias=symbol_alias,
         yf_symbol=yf_symbol,
         direction=direction,
@@ -35,10 +44,6 @@ def create_signal(
         notes=notes,
         estimated_rr=estimated_rr,
     )
-    db.add(signal)
-    db.commit()
-    db.refresh(signal)
-    return signal
 
 
 def create_trade(
@@ -54,7 +59,9 @@ def create_trade(
     open_time_utc: datetime,
 ) -> Trade:
     """Create a new trade"""
-    trade = Trade(
+    return _insert_returning_id(
+        db,
+        Trade,
         signal_id=signal_id,
         symbol_alias=symbol_alias,
         yf_symbol=yf_symbol,
@@ -66,10 +73,31 @@ def create_trade(
         state=TradeState.OPEN,
         open_time_utc=open_time_utc,
     )
-    db.add(trade)
+
+
+def _insert_returning_id(db: Session, model, **values):
+    """
+    Insert a row, returning its ID in the same round-trip, and commit.
+    
+    The returned instance is built from the inserted values and attached
+    to the session as if it had been loaded, so no refresh SELECT is
+    needed; columns that were not given load lazily on first access.
+    
+    Args:
+        db: Database session
+        model: Mapped class with an integer ``id`` primary key
+        **values: Column values of the new row
+    
+    Returns:
+        Persistent instance of model
+    """
+    new_id = db.execute(insert(model).values(**values).returning(model.id)).scalar_one()
     db.commit()
-    db.refresh(trade)
-    return trade
+    
+    instance = model(id=new_id, **values)
+    make_transient_to_detached(instance)
+    db.add(instance)
+    return instance
 
 
 def get_open_trades(db: Session, symbol_alias: Optional[str] = None) -> List[Trade]:
@@ -169,6 +197,31 @@ def create_heartbeat(
     return heartbeat
 
 
+def create_heartbeats_bulk(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    Create heartbeat records in a single INSERT and commit.
+    
+    Args:
+        db: Database session
+        rows: Heartbeat column values, one dict per record (same keys as
+            the create_heartbeat arguments)
+    
+    Returns:
+        IDs of the created records, in the order of rows
+    """
+    if not rows:
+        return []
+    
+    # Without sort_by_parameter_order the RETURNING rows of a batched
+    # insert are not guaranteed to come back in parameter order
+    ids = db.execute(
+        insert(Heartbeat).returning(Heartbeat.id, sort_by_parameter_order=True),
+        rows
+    ).scalars().all()
+    db.commit()
+    return list(ids)
+
+
 def create_error_log(
     db: Session,
     timestamp_utc: datetime,
@@ -195,6 +248,96 @@ def create_error_log(
     return error_log
 
 
+def create_error_logs_bulk(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    Create error log records in a single INSERT and commit.
+    
+    Args:
+        db: Database session
+        rows: Error log column values, one dict per record (same keys as
+            the create_error_log arguments)
+    
+    Returns:
+        IDs of the created records, in the order of rows
+    """
+    if not rows:
+        return []
+    
+    ids = db.execute(
+        insert(ErrorLog).returning(ErrorLog.id, sort_by_parameter_order=True),
+        rows
+    ).scalars().all()
+    db.commit()
+    return list(ids)
+
+
+def copy_heartbeats(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """
+    Append heartbeat records, using COPY FROM STDIN on PostgreSQL.
+    
+    Other databases fall back to create_heartbeats_bulk.
+    
+    Args:
+        db: Database session
+        rows: Heartbeat column values, one dict per record
+    
+    Returns:
+        Number of records written
+    """
+    if not rows:
+        return 0
+    if db.get_bind().dialect.name != "postgresql":
+        return len(create_heartbeats_bulk(db, rows))
+    
+    return _copy_rows(db, Heartbeat.__tablename__, _HEARTBEAT_COLUMNS, rows)
+
+
+def _copy_rows(
+    db: Session,
+    table: str,
+    columns: List[str],
+    rows: Iterable[Dict[str, Any]],
+) -> int:
+    """
+    Stream rows into a table with a single psycopg2 COPY and commit.
+    
+    Args:
+        db: Database session (PostgreSQL)
+        table: Table name
+        columns: Columns to fill; missing keys are written as NULL
+        rows: Column values, one dict per record
+    
+    Returns:
+        Number of records written
+    """
+    buffer = io.StringIO()
+    count = 0
+    for row in rows:
+        buffer.write(",".join(_csv_field(row.get(column)) for column in columns))
+        buffer.write("\n")
+        count += 1
+    buffer.seek(0)
+    
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+    finally:
+        cursor.close()
+    
+    db.commit()
+    return count
+
+
+def _csv_field(value: Any) -> str:
+    """Format a value for COPY CSV: unquoted empty for NULL, else quoted"""
+    if value is None:
+        return ""
+    return '"' + str(value).replace('"', '""') + '"'
+
+
 def get_recent_errors(
     db: Session,
     hours: int = 24,
@@ -220,17 +363,34 @@ def get_mae_mfe_stats(
     """
     Calculate MAE/MFE statistics from historical closed trades.
     
+    On PostgreSQL the statistics are aggregated in the database; other
+    databases (SQLite in tests) fetch the prices and aggregate in NumPy.
+    
     Returns:
         Dictionary with median_mae, median_mfe, avg_mae, avg_mfe
     """
-    closed_trades = get_closed_trades(
-        db,
-        symbol_alias=symbol_alias,
-        direction=direction,
-        limit=limit
+    query = (
+        select(
+            Trade.actual_entry_price.label("entry"),
+            Trade.close_price.label("close"),
+        )
+        .where(Trade.state != TradeState.OPEN)
+        .order_by(Trade.close_time_utc.desc())
     )
+    if symbol_alias:
+        query = query.where(Trade.symbol_alias == symbol_alias)
+    if direction:
+        query = query.where(Trade.direction == direction)
+    if limit:
+        query = query.limit(limit)
+    
+    if db.get_bind().dialect.name == "postgresql":
+        return _aggregate_mae_mfe_sql(db, query, direction)
+    
+    # Missing prices become NaN
+    prices = np.array(db.execute(query).all(), dtype=np.float64).reshape(-1, 2)
     
-    if not closed_trades:
+    if len(prices) == 0:
         return {
             "median_mae": None,
             "median_mfe": None,
@@ -239,36 +399,91 @@ def get_mae_mfe_stats(
             "count": 0,
         }
     
+    entry, close = prices[:, 0], prices[:, 1]
+    
     # Calculate MAE/MFE for each trade
     # Note: This is a simplified version. In production, you'd store
     # actual MAE/MFE values during trade monitoring
-    maes = []
-    mfes = []
-    
-    for trade in closed_trades:
-        if trade.close_price and trade.actual_entry_price:
-            if direction == "buy":
-                # For buy: MAE is lowest point, MFE is highest point
-                # Simplified: use close price as proxy
-                pnl = trade.close_price - trade.actual_entry_price
-                if pnl < 0:
-                    maes.append(abs(pnl))
-                else:
-                    mfes.append(pnl)
-            else:
-                # For sell: opposite
-                pnl = trade.actual_entry_price - trade.close_price
-                if pnl < 0:
-                    maes.append(abs(pnl))
-                else:
-                    mfes.append(pnl)
-    
-    import statistics
+    # Simplified: use close price as proxy; trades without prices are skipped
+    valid = (entry != 0) & (close != 0) & ~np.isnan(entry) & ~np.isnan(close)
+    pnl = close[valid] - entry[valid]
+    if direction != "buy":
+        pnl = -pnl
+    
+    maes = -pnl[pnl < 0]
+    mfes = pnl[pnl >= 0]
+    
+    return {
+        "median_mae": _median(maes),
+        "median_mfe": _median(mfes),
+        "avg_mae": _mean(maes),
+        "avg_mfe": _mean(mfes),
+        "count": len(prices),
+    }
+
+
+def _median(values: np.ndarray) -> Optional[float]:
+    """Median via partial selection (no full sort), None if empty"""
+    n = len(values)
+    if n == 0:
+        return None
+    
+    mid = n // 2
+    if n % 2:
+        return float(np.partition(values, mid)[mid])
+    
+    middle = np.partition(values, (mid - 1, mid))
+    return float((middle[mid - 1] + middle[mid]) / 2)
+
+
+def _mean(values: np.ndarray) -> Optional[float]:
+    """Mean with float64 pairwise summation, None if empty"""
+    if len(values) == 0:
+        return None
+    return float(np.add.reduce(values, dtype=np.float64) / len(values))
+
+
+def _aggregate_mae_mfe_sql(db: Session, query: Select, direction: str) -> dict:
+    """
+    Aggregate MAE/MFE statistics in the database (PostgreSQL only).
+    
+    Mirrors the NumPy path of get_mae_mfe_stats: trades without prices
+    count towards the total but not towards MAE/MFE.
+    
+    Args:
+        db: Database session
+        query: Query selecting entry and close prices of the trades
+        direction: Trade direction ("buy" or "sell")
+    
+    Returns:
+        Dictionary with median_mae, median_mfe, avg_mae, avg_mfe, count
+    """
+    trades = query.subquery()
+    
+    if direction == "buy":
+        pnl = trades.c.close - trades.c.entry
+    else:
+        pnl = trades.c.entry - trades.c.close
+    
+    # NULL for trades skipped from each statistic, which aggregates ignore
+    has_prices = and_(trades.c.entry != 0, trades.c.close != 0)
+    mae = case((and_(has_prices, pnl < 0), -pnl))
+    mfe = case((and_(has_prices, pnl >= 0), pnl))
+    
+    row = db.execute(
+        select(
+            func.percentile_cont(0.5).within_group(mae).label("median_mae"),
+            func.percentile_cont(0.5).within_group(mfe).label("median_mfe"),
+            func.avg(mae).label("avg_mae"),
+            func.avg(mfe).label("avg_mfe"),
+            func.count().label("count"),
+        )
+    ).one()
     
     return {
-        "median_mae": statistics.median(maes) if maes else None,
-        "median_mfe": statistics.median(mfes) if mfes else None,
-        "avg_mae": statistics.mean(maes) if maes else None,
-        "avg_mfe": statistics.mean(mfes) if mfes else None,
-        "count": len(closed_trades),
+        "median_mae": float(row.median_mae) if row.median_mae is not None else None,
+        "median_mfe": float(row.median_mfe) if row.median_mfe is not None else None,
+        "avg_mae": float(row.avg_mae) if row.avg_mae is not None else None,
+        "avg_mfe": float(row.avg_mfe) if row.avg_mfe is not None else None,
+        "count": row.count,
     }
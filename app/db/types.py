@@ -0,0 +1,20 @@
+"""Custom column types"""
+import sys
+from typing import Optional
+from sqlalchemy import String
+from sqlalchemy.types import TypeDecorator
+
+
+class InternedString(TypeDecorator):
+    """
+    String column whose loaded values are interned.
+    
+    Used for low-cardinality columns (symbols, directions, strategy names)
+    so every loaded row shares one str object per distinct value instead
+    of holding its own copy.
+    """
+    impl = String
+    cache_ok = True
+    
+    def process_result_value(self, value: Optional[str], dialect) -> Optional[str]:
+        return sys.intern(value) if value is not None else None
@@ -52,7 +52,15 @@ async def lifespan(app: FastAPI):
         
         # Initialize data provider (skip validation to avoid startup failures)
         from app.data.yfinance_provider import YFinanceMarketDataProvider
-        data_provider = YFinanceMarketDataProvider()
+        # Default cache bound: every interval of every symbol, with 2x headroom
+        max_cache_entries = config.scanner.max_cache_entries or max(
+            64,
+            len(config.scanner.symbols) * len(YFinanceMarketDataProvider.INTERVAL_MAP) * 2
+        )
+        data_provider = YFinanceMarketDataProvider(
+            cache_dir=config.scanner.cache_dir,
+            max_cache_entries=max_cache_entries
+        )
         logger.info("✓ Data provider initialized")
         
         logger.info(f"Configured symbols: {', '.join(config.scanner.symbols.keys())}")
@@ -4,7 +4,7 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 
 from app.notifications.telegram_service import TelegramNotificationService
-from app.db.queries import create_heartbeat, get_open_trades, get_recent_errors
+from app.db.queries import copy_heartbeats, get_open_trades, get_recent_errors
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +35,9 @@ class HeartbeatService:
         """Send heartbeat for each symbol"""
         logger.info("Sending heartbeats...")
         
+        # Heartbeat records of all symbols, written in one batch
+        heartbeat_rows = []
+        
         for alias in self.config.scanner.symbols.keys():
             try:
                 # Get open trade count
@@ -48,14 +51,13 @@ class HeartbeatService:
                 # Get last scan time
                 last_scan = self.last_scan_times.get(alias, datetime.utcnow())
                 
-                # Create heartbeat record
-                create_heartbeat(
-                    db=self.db,
-                    symbol_alias=alias,
-                    timestamp_utc=datetime.utcnow(),
-                    open_trade_count=open_count,
-                    last_error=last_error
-                )
+                # Queue heartbeat record
+                heartbeat_rows.append({
+                    'symbol_alias': alias,
+                    'timestamp_utc': datetime.utcnow(),
+                    'open_trade_count': open_count,
+                    'last_error': last_error,
+                })
                 
                 # Send Telegram notification
                 await self.notification_service.send_heartbeat(
@@ -69,6 +71,11 @@ class HeartbeatService:
             
             except Exception as e:
                 logger.error(f"Error sending heartbeat for {alias}: {e}")
+        
+        try:
+            copy_heartbeats(self.db, heartbeat_rows)
+        except Exception as e:
+            logger.error(f"Error saving heartbeats: {e}")
     
     def update_last_scan(self, alias: str, timestamp: datetime) -> None:
         """Update last scan time for symbol"""
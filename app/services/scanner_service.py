@@ -92,8 +92,9 @@ class SymbolScannerService:
             m5_df = await self.data_provider.get_candles(yf_symbol, "5m", timedelta(days=3))
             m1_df = await self.data_provider.get_candles(yf_symbol, "1m", timedelta(days=1))
             
-            # Get current price
-            current_price = h1_df['close'].iloc[-1] if not h1_df.empty else 0
+            # Get current price (plain float: candle columns may be float32,
+            # which the database driver cannot adapt)
+            current_price = float(h1_df['close'].iloc[-1]) if not h1_df.empty else 0.0
             
             # Step 2: Build context
             ctx = MultiTimeframeContext(
@@ -181,8 +182,8 @@ class SymbolScannerService:
                     current_price=current_price,
                     current_sl=trade.stop_loss,
                     current_tp=trade.take_profit,
-                    candle_high=h1_df['high'].iloc[-1] if not h1_df.empty else current_price,
-                    candle_low=h1_df['low'].iloc[-1] if not h1_df.empty else current_price,
+                    candle_high=float(h1_df['high'].iloc[-1]) if not h1_df.empty else current_price,
+                    candle_low=float(h1_df['low'].iloc[-1]) if not h1_df.empty else current_price,
                     mtf_context=ctx
                 )
                 
@@ -0,0 +1,67 @@
+"""Database test fixtures"""
+from contextlib import contextmanager
+from typing import Iterator
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from app.db.database import Base
+
+
+def create_test_engine() -> Engine:
+    """
+    Create an in-memory SQLite engine with the full schema.
+    
+    All sessions share one connection (StaticPool), so the schema is
+    created once. pysqlite's implicit transaction handling is disabled
+    so that SAVEPOINTs used by rollback_session behave.
+    
+    Returns:
+        Engine with all tables created
+    """
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    
+    @event.listens_for(engine, "connect")
+    def _disable_implicit_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN")
+    
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@contextmanager
+def rollback_session(engine: Engine) -> Iterator[Session]:
+    """
+    Session whose work is rolled back when the context exits.
+    
+    The session joins an outer transaction and turns its own commits into
+    savepoints, so code under test can commit freely while the schema is
+    shared between test examples. Objects are not expired on commit and
+    nothing is autoflushed, so assertions read attributes from the
+    identity map instead of issuing SELECTs.
+    
+    Args:
+        engine: Engine from create_test_engine
+    
+    Yields:
+        Database session
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+        expire_on_commit=False,
+        autoflush=False,
+    )
+    
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
@@ -1,10 +1,9 @@
 """Property-based tests for API endpoints"""
 import pytest
-from fastapi.testclient import TestClient
 
 
 # Property 43 & 44: Health endpoint
-def test_health_endpoint_properties():
+def test_health_endpoint_properties(api_client):
     """
     Feature: trading-scanner-python, Property 43 & 44
     
@@ -13,11 +12,8 @@ def test_health_endpoint_properties():
     
     Validates: Requirements 12.2, 12.3
     """
-    from app.main import app
-    client = TestClient(app)
-    
     # Test health endpoint
-    response = client.get("/health")
+    response = api_client.get("/health")
     
     # Should return JSON
     assert response.headers["content-type"] == "application/json"
@@ -2,8 +2,9 @@
 Property-based tests for configuration management.
 """
 import os
+from datetime import datetime
 import pytest
-from hypothesis import given, settings, strategies as st
+from hypothesis import Phase, example, given, settings, strategies as st
 from app.config.settings import (
     TelegramConfig,
     SmtpConfig,
@@ -13,18 +14,79 @@ from app.config.settings import (
 )
 
 
+# Environment shared by every configuration validation example
+STATIC_ENV_VARS = {
+    "SMTP__PORT": "465",
+    "SMTP__FROM_EMAIL": "test@test.com",
+    "SMTP__TO_EMAIL": "test@test.com",
+    "SMTP__USE_SSL": "true",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "APP_TIMEZONE": "Africa/Johannesburg",
+    "SCANNER__SCAN_INTERVAL_SECONDS": "60",
+    "SCANNER__SYMBOLS__TEST": "^TEST",
+}
+
+# Environment variables varied per example, restored after the module
+REQUIRED_ENV_VARS = [
+    "TELEGRAM__BOT_TOKEN",
+    "TELEGRAM__CHAT_ID",
+    "SMTP__SERVER",
+    "SMTP__USER",
+    "SMTP__PASSWORD",
+    "POSTGRES_USER",
+    "POSTGRES_PASSWORD",
+    "POSTGRES_DB",
+]
+
+
+# Optional short environment value. Environment variables cannot hold NUL
+# or lone surrogates, so those characters are excluded
+OPT_ENV_STR = st.one_of(
+    st.none(),
+    st.text(
+        alphabet=st.characters(blacklist_categories=("Cs",), blacklist_characters="\x00"),
+        min_size=1,
+        max_size=16,
+    ),
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def static_config_env():
+    """Set the static configuration environment once for the module"""
+    with pytest.MonkeyPatch.context() as mp:
+        for key, value in STATIC_ENV_VARS.items():
+            mp.setenv(key, value)
+        # Registers the original values for restoring at teardown
+        for key in REQUIRED_ENV_VARS:
+            mp.setenv(key, "")
+        yield
+
+
 # Feature: trading-scanner-python, Property 34: Configuration validation
 @given(
-    telegram_token=st.one_of(st.none(), st.text(min_size=1)),
-    chat_id=st.one_of(st.none(), st.text(min_size=1)),
-    smtp_server=st.one_of(st.none(), st.text(min_size=1)),
-    smtp_user=st.one_of(st.none(), st.text(min_size=1)),
-    smtp_password=st.one_of(st.none(), st.text(min_size=1)),
-    db_user=st.one_of(st.none(), st.text(min_size=1)),
-    db_password=st.one_of(st.none(), st.text(min_size=1)),
-    db_name=st.one_of(st.none(), st.text(min_size=1)),
+    telegram_token=OPT_ENV_STR,
+    chat_id=OPT_ENV_STR,
+    smtp_server=OPT_ENV_STR,
+    smtp_user=OPT_ENV_STR,
+    smtp_password=OPT_ENV_STR,
+    db_user=OPT_ENV_STR,
+    db_password=OPT_ENV_STR,
+    db_name=OPT_ENV_STR,
 )
-@settings(max_examples=100)
+# A fully valid configuration is always checked first
+@example(
+    telegram_token="valid_token",
+    chat_id="123456",
+    smtp_server="smtp.test.com",
+    smtp_user="user@test.com",
+    smtp_password="password",
+    db_user="testuser",
+    db_password="testpass",
+    db_name="testdb",
+)
+@settings(max_examples=25, phases=[Phase.explicit, Phase.generate, Phase.shrink], deadline=None)
 def test_configuration_validation_rejects_invalid_configs(
     telegram_token, chat_id, smtp_server, smtp_user, smtp_password,
     db_user, db_password, db_name
@@ -37,112 +99,33 @@ def test_configuration_validation_rejects_invalid_configs(
     
     Validates: Requirements 9.2, 9.3
     """
-    # Set up environment with potentially invalid values
-    env_backup = {}
-    env_vars = {
-        "TELEGRAM__BOT_TOKEN": telegram_token or "",
-        "TELEGRAM__CHAT_ID": chat_id or "",
-        "SMTP__SERVER": smtp_server or "",
-        "SMTP__PORT": "465",
-        "SMTP__USER": smtp_user or "",
-        "SMTP__PASSWORD": smtp_password or "",
-        "SMTP__FROM_EMAIL": "test@test.com",
-        "SMTP__TO_EMAIL": "test@test.com",
-        "SMTP__USE_SSL": "true",
-        "POSTGRES_USER": db_user or "",
-        "POSTGRES_PASSWORD": db_password or "",
-        "POSTGRES_DB": db_name or "",
-        "POSTGRES_HOST": "localhost",
-        "POSTGRES_PORT": "5432",
-        "APP_TIMEZONE": "Africa/Johannesburg",
-        "SCANNER__SCAN_INTERVAL_SECONDS": "60",
-        "SCANNER__SYMBOLS__TEST": "^TEST",
-    }
-    
-    # Backup and set environment
-    for key, value in env_vars.items():
-        env_backup[key] = os.environ.get(key)
-        os.environ[key] = value
-    
-    try:
-        # Check if all required fields are present
-        all_required_present = all([
-            telegram_token,
-            chat_id,
-            smtp_server,
-            smtp_user,
-            smtp_password,
-            db_user,
-            db_password,
-            db_name,
-        ])
-        
-        if all_required_present:
-            # Should succeed
+    # Set the hypothesized values; the static variables are set once by
+    # static_config_env, which also restores everything afterwards
+    values = [
+        telegram_token, chat_id, smtp_server, smtp_user, smtp_password,
+        db_user, db_password, db_name,
+    ]
+    for key, value in zip(REQUIRED_ENV_VARS, values):
+        os.environ[key] = value or ""
+    
+    # Check if all required fields are present
+    all_required_present = all(values)
+    
+    if all_required_present:
+        # Should succeed
+        config = AppConfig()
+        config.validate_all()
+        assert config.telegram.bot_token == telegram_token
+        assert config.smtp.server == smtp_server
+        assert config.database.user == db_user
+    else:
+        # Should fail validation
+        with pytest.raises(ValueError) as exc_info:
             config = AppConfig()
             config.validate_all()
-            assert config.telegram.bot_token == telegram_token
-            assert config.smtp.server == smtp_server
-            assert config.database.user == db_user
-        else:
-            # Should fail validation
-            with pytest.raises(ValueError) as exc_info:
-                config = AppConfig()
-                config.validate_all()
-            
-            # Error message should be clear
-            assert "Configuration validation failed" in str(exc_info.value)
-    
-    finally:
-        # Restore environment
-        for key, value in env_backup.items():
-            if value is None:
-                os.environ.pop(key, None)
-            else:
-                os.environ[key] = value
-
-
-def test_configuration_validation_with_valid_config():
-    """Test that valid configuration passes validation"""
-    env_backup = {}
-    env_vars = {
-        "TELEGRAM__BOT_TOKEN": "valid_token",
-        "TELEGRAM__CHAT_ID": "123456",
-        "SMTP__SERVER": "smtp.test.com",
-        "SMTP__PORT": "465",
-        "SMTP__USER": "user@test.com",
-        "SMTP__PASSWORD": "password",
-        "SMTP__FROM_EMAIL": "from@test.com",
-        "SMTP__TO_EMAIL": "to@test.com",
-        "SMTP__USE_SSL": "true",
-        "POSTGRES_USER": "testuser",
-        "POSTGRES_PASSWORD": "testpass",
-        "POSTGRES_DB": "testdb",
-        "POSTGRES_HOST": "localhost",
-        "POSTGRES_PORT": "5432",
-        "APP_TIMEZONE": "Africa/Johannesburg",
-        "SCANNER__SYMBOLS__TEST": "^TEST",
-    }
-    
-    for key, value in env_vars.items():
-        env_backup[key] = os.environ.get(key)
-        os.environ[key] = value
-    
-    try:
-        config = AppConfig()
-        config.validate_all()  # Should not raise
         
-        assert config.telegram.bot_token == "valid_token"
-        assert config.smtp.server == "smtp.test.com"
-        assert config.database.user == "testuser"
-    
-    finally:
-        for key, value in env_backup.items():
-            if value is None:
-                os.environ.pop(key, None)
-            else:
-                os.environ[key] = value
-
+        # Error message should be clear
+        assert "Configuration validation failed" in str(exc_info.value)
 
 
 # Feature: trading-scanner-python, Property 35: Symbol mapping parsing
@@ -152,7 +135,8 @@ def test_configuration_validation_with_valid_config():
         max_size=20,
         alphabet=st.characters(whitelist_categories=('Lu', 'Ll', 'Nd'), min_codepoint=65, max_codepoint=122)
     ).filter(lambda x: x.isalnum()),
-    yf_symbol=st.text(min_size=1, max_size=20).filter(lambda x: len(x.strip()) > 0)
+    # Yahoo-style tickers such as ^DJI, XAUUSD=X or BRK.B
+    yf_symbol=st.from_regex(r"[A-Za-z0-9^=.]{1,10}", fullmatch=True)
 )
 @settings(max_examples=100)
 def test_symbol_mapping_parsing(alias, yf_symbol):
@@ -165,32 +149,21 @@ def test_symbol_mapping_parsing(alias, yf_symbol):
     
     Validates: Requirements 9.4
     """
-    env_backup = {}
-    env_key = f"SCANNER__SYMBOLS__{alias}"
-    
-    # Backup and set environment
-    env_backup[env_key] = os.environ.get(env_key)
-    os.environ[env_key] = yf_symbol
-    
-    try:
+    # The monkeypatch fixture is function-scoped, which Hypothesis would
+    # share across examples; a context undoes the change per example
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv(f"SCANNER__SYMBOLS__{alias}", yf_symbol)
+        
         # Parse symbols from environment
         symbols = ScannerConfig.load_symbols_from_env()
         
         # Should contain our mapping
         assert alias in symbols
         assert symbols[alias] == yf_symbol
-    
-    finally:
-        # Restore environment
-        if env_backup[env_key] is None:
-            os.environ.pop(env_key, None)
-        else:
-            os.environ[env_key] = env_backup[env_key]
 
 
-def test_symbol_mapping_parsing_multiple_symbols():
+def test_symbol_mapping_parsing_multiple_symbols(monkeypatch):
     """Test parsing multiple symbol mappings"""
-    env_backup = {}
     test_symbols = {
         "US30": "^DJI",
         "XAUUSD": "XAUUSD=X",
@@ -198,31 +171,21 @@ def test_symbol_mapping_parsing_multiple_symbols():
     }
     
     for alias, yf_symbol in test_symbols.items():
-        env_key = f"SCANNER__SYMBOLS__{alias}"
-        env_backup[env_key] = os.environ.get(env_key)
-        os.environ[env_key] = yf_symbol
+        monkeypatch.setenv(f"SCANNER__SYMBOLS__{alias}", yf_symbol)
     
-    try:
-        symbols = ScannerConfig.load_symbols_from_env()
-        
-        for alias, yf_symbol in test_symbols.items():
-            assert alias in symbols
-            assert symbols[alias] == yf_symbol
+    symbols = ScannerConfig.load_symbols_from_env()
     
-    finally:
-        for env_key, value in env_backup.items():
-            if value is None:
-                os.environ.pop(env_key, None)
-            else:
-                os.environ[env_key] = value
+    for alias, yf_symbol in test_symbols.items():
+        assert alias in symbols
+        assert symbols[alias] == yf_symbol
 
 
 
 # Feature: trading-scanner-python, Property 36: Timezone configuration usage
 @given(
     utc_timestamp=st.datetimes(
-        min_value=pytest.importorskip("datetime").datetime(2020, 1, 1),
-        max_value=pytest.importorskip("datetime").datetime(2030, 12, 31)
+        min_value=datetime(2020, 1, 1),
+        max_value=datetime(2030, 12, 31)
     )
 )
 @settings(max_examples=100)
@@ -235,7 +198,6 @@ def test_timezone_configuration_usage(utc_timestamp):
     
     Validates: Requirements 9.5
     """
-    from datetime import datetime
     from zoneinfo import ZoneInfo
     from app.config.timezone import TimezoneConverter
     
@@ -256,7 +218,6 @@ def test_timezone_configuration_usage(utc_timestamp):
 
 def test_timezone_converter_with_different_timezones():
     """Test timezone converter with various timezones"""
-    from datetime import datetime
     from zoneinfo import ZoneInfo
     from app.config.timezone import TimezoneConverter
     
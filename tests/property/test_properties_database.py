@@ -2,13 +2,30 @@
 Property-based tests for database operations.
 """
 import pytest
-from hypothesis import given, settings, strategies as st
+from hypothesis import Phase, given, settings, strategies as st
 from datetime import datetime, timedelta
 from app.db.models import Signal, Trade, TradeState, Heartbeat, ErrorLog
+from tests.fixtures.database import create_test_engine, rollback_session
+
+
+# Short letter/digit strings, like real symbols
+ALPHA_NUM = st.text(
+    alphabet=st.characters(whitelist_categories=("Lu", "Ll", "Nd")),
+    min_size=1,
+    max_size=8,
+)
+
+
+@pytest.fixture(scope="module")
+def shared_db():
+    """In-memory database with the schema created once for the module"""
+    engine = create_test_engine()
+    yield engine
+    engine.dispose()
 
 
 # Feature: trading-scanner-python, Property 37: Automatic database migrations
-def test_automatic_database_migrations():
+def test_automatic_database_migrations(migrated_db):
     """
     Feature: trading-scanner-python, Property 37: Automatic database migrations
     
@@ -18,25 +35,10 @@ def test_automatic_database_migrations():
     
     Validates: Requirements 10.2
     """
-    from app.db.migration_runner import run_migrations
-    from app.db.database import init_database, get_engine
     from sqlalchemy import inspect
     
-    # Initialize test database
-    test_db_url = "sqlite:///:memory:"
-    init_database(test_db_url)
-    
-    # Run migrations
-    try:
-        run_migrations()
-    except Exception:
-        # For in-memory SQLite, migrations might not work perfectly
-        # In production with PostgreSQL, this should work
-        pass
-    
-    # Verify tables exist
-    engine = get_engine()
-    inspector = inspect(engine)
+    # Migrations were run once by the session-scoped migrated_db fixture
+    inspector = inspect(migrated_db)
     table_names = inspector.get_table_names()
     
     # At minimum, we should have our core tables
@@ -46,15 +48,15 @@ def test_automatic_database_migrations():
 
 # Feature: trading-scanner-python, Property 38: Signal persistence
 @given(
-    symbol_alias=st.text(min_size=1, max_size=20),
-    yf_symbol=st.text(min_size=1, max_size=20),
+    symbol_alias=ALPHA_NUM,
+    yf_symbol=ALPHA_NUM,
     direction=st.sampled_from(["buy", "sell"]),
     entry_price=st.floats(min_value=0.01, max_value=100000.0, allow_nan=False, allow_infinity=False),
     sl=st.floats(min_value=0.01, max_value=100000.0, allow_nan=False, allow_infinity=False),
     tp=st.floats(min_value=0.01, max_value=100000.0, allow_nan=False, allow_infinity=False),
 )
-@settings(max_examples=100)
-def test_signal_persistence(symbol_alias, yf_symbol, direction, entry_price, sl, tp):
+@settings(max_examples=25, phases=[Phase.generate, Phase.shrink], deadline=None)
+def test_signal_persistence(shared_db, symbol_alias, yf_symbol, direction, entry_price, sl, tp):
     """
     Feature: trading-scanner-python, Property 38: Signal persistence
     
@@ -63,57 +65,49 @@ def test_signal_persistence(symbol_alias, yf_symbol, direction, entry_price, sl,
     
     Validates: Requirements 10.3
     """
-    from app.db.database import init_database, create_all_tables, drop_all_tables
     from app.db.queries import create_signal
-    from app.db.session import get_db_session
-    
-    # Initialize test database
-    test_db_url = "sqlite:///:memory:"
-    init_database(test_db_url)
-    create_all_tables()
-    
-    try:
-        with get_db_session() as db:
-            # Create signal
-            signal = create_signal(
-                db=db,
-                symbol_alias=symbol_alias,
-                yf_symbol=yf_symbol,
-                direction=direction,
-                time_generated_utc=datetime.utcnow(),
-                entry_price_at_signal=entry_price,
-                initial_sl=sl,
-                initial_tp=tp,
-                strategy_name="H4 FVG",
-                notes="Test signal",
-                estimated_rr=abs(tp - entry_price) / abs(entry_price - sl) if abs(entry_price - sl) > 0 else 1.0,
-            )
-            
-            # Verify all fields are persisted
-            assert signal.id is not None
-            assert signal.symbol_alias == symbol_alias
-            assert signal.yf_symbol == yf_symbol
-            assert signal.direction == direction
-            assert signal.entry_price_at_signal == entry_price
-            assert signal.initial_sl == sl
-            assert signal.initial_tp == tp
-            assert signal.strategy_name == "H4 FVG"
     
-    finally:
-        drop_all_tables()
+    now = datetime.utcnow()
+    
+    # Each example runs in a transaction that is rolled back afterwards
+    with rollback_session(shared_db) as db:
+        # Create signal
+        signal = create_signal(
+            db=db,
+            symbol_alias=symbol_alias,
+            yf_symbol=yf_symbol,
+            direction=direction,
+            time_generated_utc=now,
+            entry_price_at_signal=entry_price,
+            initial_sl=sl,
+            initial_tp=tp,
+            strategy_name="H4 FVG",
+            notes="Test signal",
+            estimated_rr=abs(tp - entry_price) / abs(entry_price - sl) if abs(entry_price - sl) > 0 else 1.0,
+        )
+        
+        # Verify all fields are persisted
+        assert signal.id is not None
+        assert signal.symbol_alias == symbol_alias
+        assert signal.yf_symbol == yf_symbol
+        assert signal.direction == direction
+        assert signal.entry_price_at_signal == entry_price
+        assert signal.initial_sl == sl
+        assert signal.initial_tp == tp
+        assert signal.strategy_name == "H4 FVG"
 
 
 # Feature: trading-scanner-python, Property 39: Trade persistence
 @given(
-    symbol_alias=st.text(min_size=1, max_size=20),
-    yf_symbol=st.text(min_size=1, max_size=20),
+    symbol_alias=ALPHA_NUM,
+    yf_symbol=ALPHA_NUM,
     direction=st.sampled_from(["buy", "sell"]),
     entry_price=st.floats(min_value=0.01, max_value=100000.0, allow_nan=False, allow_infinity=False),
     sl=st.floats(min_value=0.01, max_value=100000.0, allow_nan=False, allow_infinity=False),
     tp=st.floats(min_value=0.01, max_value=100000.0, allow_nan=False, allow_infinity=False),
 )
-@settings(max_examples=100)
-def test_trade_persistence(symbol_alias, yf_symbol, direction, entry_price, sl, tp):
+@settings(max_examples=25, phases=[Phase.generate, Phase.shrink], deadline=None)
+def test_trade_persistence(shared_db, symbol_alias, yf_symbol, direction, entry_price, sl, tp):
     """
     Feature: trading-scanner-python, Property 39: Trade persistence
     
@@ -123,67 +117,105 @@ def test_trade_persistence(symbol_alias, yf_symbol, direction, entry_price, sl,
     
     Validates: Requirements 10.4
     """
-    from app.db.database import init_database, create_all_tables, drop_all_tables
     from app.db.queries import create_signal, create_trade
-    from app.db.session import get_db_session
-    
-    # Initialize test database
-    test_db_url = "sqlite:///:memory:"
-    init_database(test_db_url)
-    create_all_tables()
-    
-    try:
-        with get_db_session() as db:
-            # Create signal first
-            signal = create_signal(
-                db=db,
-                symbol_alias=symbol_alias,
-                yf_symbol=yf_symbol,
-                direction=direction,
-                time_generated_utc=datetime.utcnow(),
-                entry_price_at_signal=entry_price,
-                initial_sl=sl,
-                initial_tp=tp,
-                strategy_name="H4 FVG",
-            )
-            
-            # Create trade
-            trade = create_trade(
-                db=db,
-                signal_id=signal.id,
-                symbol_alias=symbol_alias,
-                yf_symbol=yf_symbol,
-                direction=direction,
-                planned_entry_price=entry_price,
-                actual_entry_price=entry_price,
-                stop_loss=sl,
-                take_profit=tp,
-                open_time_utc=datetime.utcnow(),
-            )
-            
-            # Verify all fields are persisted
-            assert trade.id is not None
-            assert trade.signal_id == signal.id
-            assert trade.symbol_alias == symbol_alias
-            assert trade.state == TradeState.OPEN
-            assert trade.stop_loss == sl
-            assert trade.take_profit == tp
-            
-            # Verify relationship
-            assert trade.signal.id == signal.id
     
-    finally:
-        drop_all_tables()
+    now = datetime.utcnow()
+    
+    # Each example runs in a transaction that is rolled back afterwards
+    with rollback_session(shared_db) as db:
+        # Create signal first
+        signal = create_signal(
+            db=db,
+            symbol_alias=symbol_alias,
+            yf_symbol=yf_symbol,
+            direction=direction,
+            time_generated_utc=now,
+            entry_price_at_signal=entry_price,
+            initial_sl=sl,
+            initial_tp=tp,
+            strategy_name="H4 FVG",
+        )
+        
+        # Create trade
+        trade = create_trade(
+            db=db,
+            signal_id=signal.id,
+            symbol_alias=symbol_alias,
+            yf_symbol=yf_symbol,
+            direction=direction,
+            planned_entry_price=entry_price,
+            actual_entry_price=entry_price,
+            stop_loss=sl,
+            take_profit=tp,
+            open_time_utc=now,
+        )
+        
+        # Verify all fields are persisted
+        assert trade.id is not None
+        assert trade.signal_id == signal.id
+        assert trade.symbol_alias == symbol_alias
+        assert trade.state == TradeState.OPEN
+        assert trade.stop_loss == sl
+        assert trade.take_profit == tp
+        
+        # Verify relationship
+        assert trade.signal.id == signal.id
+
+
+@given(state=st.sampled_from(list(TradeState)))
+@settings(max_examples=10, deadline=None)
+def test_trade_state_round_trip(shared_db, state):
+    """Test that trade states are stored by value and load back as TradeState"""
+    from sqlalchemy import select, text
+    from app.db.queries import create_signal, create_trade, update_trade_state
+    
+    now = datetime.utcnow()
+    
+    # Each example runs in a transaction that is rolled back afterwards
+    with rollback_session(shared_db) as db:
+        signal = create_signal(
+            db=db,
+            symbol_alias="US30",
+            yf_symbol="^DJI",
+            direction="buy",
+            time_generated_utc=now,
+            entry_price_at_signal=100.0,
+            initial_sl=95.0,
+            initial_tp=110.0,
+            strategy_name="H4 FVG",
+        )
+        trade = create_trade(
+            db=db,
+            signal_id=signal.id,
+            symbol_alias="US30",
+            yf_symbol="^DJI",
+            direction="buy",
+            planned_entry_price=100.0,
+            actual_entry_price=100.0,
+            stop_loss=95.0,
+            take_profit=110.0,
+            open_time_utc=now,
+        )
+        update_trade_state(db=db, trade_id=trade.id, new_state=state)
+        
+        # Raw column holds the value used by the migrations' tradestate type
+        stored = db.execute(
+            text("SELECT state FROM trades WHERE id = :id"), {"id": trade.id}
+        ).scalar_one()
+        assert stored == state.value
+        
+        loaded = db.execute(select(Trade.state).where(Trade.id == trade.id)).scalar_one()
+        assert loaded is state
 
 
 # Feature: trading-scanner-python, Property 40: Historical trade query filtering
 @given(
-    target_symbol=st.text(min_size=1, max_size=10),
+    target_symbol=ALPHA_NUM,
     target_direction=st.sampled_from(["buy", "sell"]),
     num_trades=st.integers(min_value=1, max_value=20),
 )
 @settings(max_examples=50)
-def test_historical_trade_query_filtering(target_symbol, target_direction, num_trades):
+def test_historical_trade_query_filtering(shared_db, target_symbol, target_direction, num_trades):
     """
     Feature: trading-scanner-python, Property 40: Historical trade query filtering
     
@@ -192,76 +224,357 @@ def test_historical_trade_query_filtering(target_symbol, target_direction, num_t
     
     Validates: Requirements 10.5
     """
-    from app.db.database import init_database, create_all_tables, drop_all_tables
-    from app.db.queries import create_signal, create_trade, get_closed_trades, update_trade_state
-    from app.db.session import get_db_session
-    
-    # Initialize test database
-    test_db_url = "sqlite:///:memory:"
-    init_database(test_db_url)
-    create_all_tables()
-    
-    try:
-        with get_db_session() as db:
-            # Create multiple trades with different symbols and directions
-            created_trades = []
+    from sqlalchemy import insert, update
+    from app.db.queries import get_closed_trades
+    
+    now = datetime.utcnow()
+    
+    # Columns that are the same for every signal and trade
+    signal_template = {
+        "time_generated_utc": now,
+        "entry_price_at_signal": 100.0,
+        "initial_sl": 95.0,
+        "initial_tp": 110.0,
+        "strategy_name": "H4 FVG",
+    }
+    trade_template = {
+        "planned_entry_price": 100.0,
+        "actual_entry_price": 100.0,
+        "stop_loss": 95.0,
+        "take_profit": 110.0,
+        "state": TradeState.OPEN,
+        "open_time_utc": now,
+    }
+    
+    # Each example runs in a transaction that is rolled back afterwards
+    with rollback_session(shared_db) as db:
+        # Create multiple trades with different symbols and directions
+        signal_rows = []
+        for i in range(num_trades):
+            # Mix of target and non-target trades
+            symbol = target_symbol if i % 2 == 0 else "OTHER"
+            direction = target_direction if i % 3 == 0 else ("sell" if target_direction == "buy" else "buy")
             
-            for i in range(num_trades):
-                # Mix of target and non-target trades
-                symbol = target_symbol if i % 2 == 0 else "OTHER"
-                direction = target_direction if i % 3 == 0 else ("sell" if target_direction == "buy" else "buy")
-                
-                signal = create_signal(
-                    db=db,
-                    symbol_alias=symbol,
-                    yf_symbol=f"^{symbol}",
-                    direction=direction,
-                    time_generated_utc=datetime.utcnow(),
-                    entry_price_at_signal=100.0,
-                    initial_sl=95.0,
-                    initial_tp=110.0,
-                    strategy_name="H4 FVG",
-                )
-                
-                trade = create_trade(
-                    db=db,
-                    signal_id=signal.id,
-                    symbol_alias=symbol,
-                    yf_symbol=f"^{symbol}",
-                    direction=direction,
-                    planned_entry_price=100.0,
-                    actual_entry_price=100.0,
-                    stop_loss=95.0,
-                    take_profit=110.0,
-                    open_time_utc=datetime.utcnow(),
-                )
-                
-                # Close some trades
-                if i % 2 == 0:
-                    update_trade_state(
-                        db=db,
-                        trade_id=trade.id,
-                        new_state=TradeState.CLOSED_BY_TP,
-                        close_time_utc=datetime.utcnow(),
-                        close_price=110.0,
-                        close_reason="TP hit",
-                    )
-                
-                created_trades.append((trade, symbol, direction))
+            signal_rows.append({
+                **signal_template,
+                "symbol_alias": symbol,
+                "yf_symbol": f"^{symbol}",
+                "direction": direction,
+            })
         
-        with get_db_session() as db:
-            # Query closed trades for target symbol and direction
-            closed_trades = get_closed_trades(
-                db=db,
-                symbol_alias=target_symbol,
-                direction=target_direction,
+        # Insert all signals and trades with one statement each
+        signal_ids = db.execute(
+            insert(Signal).returning(Signal.id, sort_by_parameter_order=True),
+            signal_rows
+        ).scalars().all()
+        
+        trade_ids = db.execute(
+            insert(Trade).returning(Trade.id, sort_by_parameter_order=True),
+            [
+                {
+                    **trade_template,
+                    "signal_id": signal_id,
+                    "symbol_alias": row["symbol_alias"],
+                    "yf_symbol": row["yf_symbol"],
+                    "direction": row["direction"],
+                }
+                for signal_id, row in zip(signal_ids, signal_rows)
+            ]
+        ).scalars().all()
+        
+        # Close every other trade
+        db.execute(
+            update(Trade)
+            .where(Trade.id.in_(trade_ids[::2]))
+            .values(
+                state=TradeState.CLOSED_BY_TP,
+                close_time_utc=now,
+                close_price=110.0,
+                close_reason="TP hit",
             )
-            
-            # Verify all returned trades match filters
-            for trade in closed_trades:
-                assert trade.state != TradeState.OPEN
-                assert trade.symbol_alias == target_symbol
-                assert trade.direction == target_direction
-    
-    finally:
-        drop_all_tables()
+        )
+        
+        # Query closed trades for target symbol and direction
+        closed_trades = get_closed_trades(
+            db=db,
+            symbol_alias=target_symbol,
+            direction=target_direction,
+        )
+        
+        # Verify all returned trades match filters
+        for trade in closed_trades:
+            assert trade.state != TradeState.OPEN
+            assert trade.symbol_alias == target_symbol
+            assert trade.direction == target_direction
+
+
+def _seed_closed_trades(db, symbol_alias, direction, close_prices, entry_price=100.0):
+    """Insert one closed trade per close price, all entered at entry_price"""
+    from sqlalchemy import insert
+    
+    now = datetime.utcnow()
+    signal_ids = db.execute(
+        insert(Signal).returning(Signal.id, sort_by_parameter_order=True),
+        [
+            {
+                "symbol_alias": symbol_alias,
+                "yf_symbol": f"^{symbol_alias}",
+                "direction": direction,
+                "time_generated_utc": now,
+                "entry_price_at_signal": entry_price,
+                "initial_sl": 95.0,
+                "initial_tp": 110.0,
+                "strategy_name": "H4 FVG",
+            }
+            for _ in close_prices
+        ]
+    ).scalars().all()
+    
+    db.execute(
+        insert(Trade),
+        [
+            {
+                "signal_id": signal_id,
+                "symbol_alias": symbol_alias,
+                "yf_symbol": f"^{symbol_alias}",
+                "direction": direction,
+                "planned_entry_price": entry_price,
+                "actual_entry_price": entry_price,
+                "stop_loss": 95.0,
+                "take_profit": 110.0,
+                "state": TradeState.CLOSED_BY_TP,
+                "open_time_utc": now - timedelta(hours=1),
+                "close_time_utc": now + timedelta(minutes=i),
+                "close_price": close_price,
+                "close_reason": "TP hit",
+            }
+            for i, (signal_id, close_price) in enumerate(zip(signal_ids, close_prices))
+        ]
+    )
+
+
+def _reference_mae_mfe(direction, close_prices, entry_price=100.0):
+    """Plain Python MAE/MFE statistics to check get_mae_mfe_stats against"""
+    from statistics import mean, median
+    
+    pnls = [
+        close - entry_price if direction == "buy" else entry_price - close
+        for close in close_prices
+    ]
+    maes = [-pnl for pnl in pnls if pnl < 0]
+    mfes = [pnl for pnl in pnls if pnl >= 0]
+    
+    return {
+        "median_mae": median(maes) if maes else None,
+        "median_mfe": median(mfes) if mfes else None,
+        "avg_mae": mean(maes) if maes else None,
+        "avg_mfe": mean(mfes) if mfes else None,
+        "count": len(close_prices),
+    }
+
+
+def _assert_stats_match(stats, expected):
+    """Compare statistics dictionaries, allowing float rounding"""
+    assert stats.keys() == expected.keys()
+    for key, value in expected.items():
+        if value is None:
+            assert stats[key] is None, key
+        else:
+            assert stats[key] == pytest.approx(value), key
+
+
+@given(
+    direction=st.sampled_from(["buy", "sell"]),
+    close_prices=st.lists(
+        st.floats(min_value=50.0, max_value=150.0, allow_nan=False, allow_infinity=False),
+        min_size=1,
+        max_size=15,
+    ),
+)
+@settings(max_examples=25, phases=[Phase.generate, Phase.shrink], deadline=None)
+def test_mae_mfe_stats_match_reference(shared_db, direction, close_prices):
+    """Test that MAE/MFE statistics match a plain Python computation"""
+    from app.db.queries import get_mae_mfe_stats
+    
+    # Each example runs in a transaction that is rolled back afterwards
+    with rollback_session(shared_db) as db:
+        _seed_closed_trades(db, "US30", direction, close_prices)
+        # Trades for another symbol must not leak into the statistics
+        _seed_closed_trades(db, "OTHER", direction, [80.0, 120.0])
+        
+        stats = get_mae_mfe_stats(db, symbol_alias="US30", direction=direction)
+    
+    _assert_stats_match(stats, _reference_mae_mfe(direction, close_prices))
+
+
+@pytest.mark.parametrize(
+    "close_prices",
+    [
+        # Odd number of losers and winners
+        [90.0, 95.0, 97.0, 101.0, 104.0, 112.0],
+        # Even number of losers and winners
+        [90.0, 94.0, 97.0, 98.0, 102.0, 103.0, 108.0, 115.0],
+    ],
+)
+def test_mae_mfe_stats_odd_and_even_counts(shared_db, close_prices):
+    """Test that medians use the middle value or the mean of the middle two"""
+    from app.db.queries import get_mae_mfe_stats
+    
+    with rollback_session(shared_db) as db:
+        _seed_closed_trades(db, "US30", "buy", close_prices)
+        stats = get_mae_mfe_stats(db, symbol_alias="US30", direction="buy")
+    
+    _assert_stats_match(stats, _reference_mae_mfe("buy", close_prices))
+
+
+def test_mae_mfe_stats_empty_history(shared_db):
+    """Test that statistics are None with a zero count when no trades closed"""
+    from app.db.queries import create_signal, create_trade, get_mae_mfe_stats
+    
+    now = datetime.utcnow()
+    
+    with rollback_session(shared_db) as db:
+        # An open trade is not part of the history
+        signal = create_signal(
+            db=db,
+            symbol_alias="US30",
+            yf_symbol="^DJI",
+            direction="buy",
+            time_generated_utc=now,
+            entry_price_at_signal=100.0,
+            initial_sl=95.0,
+            initial_tp=110.0,
+            strategy_name="H4 FVG",
+        )
+        create_trade(
+            db=db,
+            signal_id=signal.id,
+            symbol_alias="US30",
+            yf_symbol="^DJI",
+            direction="buy",
+            planned_entry_price=100.0,
+            actual_entry_price=100.0,
+            stop_loss=95.0,
+            take_profit=110.0,
+            open_time_utc=now,
+        )
+        stats = get_mae_mfe_stats(db, symbol_alias="US30", direction="buy")
+    
+    assert stats == {
+        "median_mae": None,
+        "median_mfe": None,
+        "avg_mae": None,
+        "avg_mfe": None,
+        "count": 0,
+    }
+
+
+@pytest.mark.parametrize(
+    "values, median, mean",
+    [
+        ([], None, None),
+        ([4.0], 4.0, 4.0),
+        ([5.0, 1.0, 3.0], 3.0, 3.0),
+        ([7.0, 1.0, 4.0, 2.0], 3.0, 3.5),
+    ],
+)
+def test_median_and_mean_helpers(values, median, mean):
+    """Test the NumPy median and mean helpers on odd, even and empty input"""
+    import numpy as np
+    from app.db.queries import _mean, _median
+    
+    array = np.array(values, dtype=np.float64)
+    assert _median(array) == median
+    assert _mean(array) == mean
+
+
+@given(
+    symbols=st.lists(ALPHA_NUM, min_size=2, max_size=20),
+    counts=st.lists(st.integers(min_value=0, max_value=50), min_size=20, max_size=20),
+)
+@settings(max_examples=25, phases=[Phase.generate, Phase.shrink], deadline=None)
+def test_bulk_inserts_return_ids_in_row_order(shared_db, symbols, counts):
+    """Test that bulk-created heartbeats and error logs return IDs in row order"""
+    from app.db.queries import create_error_logs_bulk, create_heartbeats_bulk
+    
+    now = datetime.utcnow()
+    
+    # Each example runs in a transaction that is rolled back afterwards
+    with rollback_session(shared_db) as db:
+        heartbeat_rows = [
+            {"symbol_alias": symbol, "timestamp_utc": now, "open_trade_count": count}
+            for symbol, count in zip(symbols, counts)
+        ]
+        heartbeat_ids = create_heartbeats_bulk(db, heartbeat_rows)
+        
+        assert len(heartbeat_ids) == len(heartbeat_rows)
+        for heartbeat_id, row in zip(heartbeat_ids, heartbeat_rows):
+            heartbeat = db.get(Heartbeat, heartbeat_id)
+            assert heartbeat.symbol_alias == row["symbol_alias"]
+            assert heartbeat.open_trade_count == row["open_trade_count"]
+        
+        error_rows = [
+            {
+                "timestamp_utc": now,
+                "component": "scanner",
+                "severity": "ERROR",
+                "message": f"error {i}",
+                "symbol_alias": symbol,
+            }
+            for i, symbol in enumerate(symbols)
+        ]
+        error_ids = create_error_logs_bulk(db, error_rows)
+        
+        assert len(error_ids) == len(error_rows)
+        for error_id, row in zip(error_ids, error_rows):
+            error_log = db.get(ErrorLog, error_id)
+            assert error_log.message == row["message"]
+            assert error_log.symbol_alias == row["symbol_alias"]
+
+
+def test_copy_heartbeats_sqlite_fallback(shared_db):
+    """Test that copy_heartbeats falls back to a bulk INSERT outside PostgreSQL"""
+    from sqlalchemy import select
+    from app.db.queries import copy_heartbeats
+    
+    now = datetime.utcnow()
+    rows = [
+        {"symbol_alias": "US30", "timestamp_utc": now, "open_trade_count": 2},
+        {"symbol_alias": "NAS100", "timestamp_utc": now, "open_trade_count": 0, "last_error": "timeout"},
+    ]
+    
+    with rollback_session(shared_db) as db:
+        assert copy_heartbeats(db, []) == 0
+        assert copy_heartbeats(db, rows) == len(rows)
+        
+        stored = db.execute(
+            select(Heartbeat.symbol_alias, Heartbeat.open_trade_count, Heartbeat.last_error)
+            .order_by(Heartbeat.id)
+        ).all()
+    
+    assert [tuple(row) for row in stored] == [("US30", 2, None), ("NAS100", 0, "timeout")]
+
+
+@pytest.mark.parametrize(
+    "value, field",
+    [
+        (None, ""),
+        ("", '""'),
+        ("plain", '"plain"'),
+        ('say "hi"', '"say ""hi"""'),
+        ("line 1\nline 2", '"line 1\nline 2"'),
+        ("a,b", '"a,b"'),
+        (3, '"3"'),
+    ],
+)
+def test_csv_field_escaping(value, field):
+    """Test that COPY CSV fields quote values and keep NULL distinct from empty"""
+    import csv
+    import io
+    from app.db.queries import _csv_field
+    
+    assert _csv_field(value) == field
+    
+    # A CSV reader gets the original text back from the field
+    parsed = next(csv.reader(io.StringIO(_csv_field(value) + ",\n")))
+    assert parsed[0] == ("" if value is None else str(value))
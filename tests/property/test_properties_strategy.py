@@ -107,6 +107,41 @@ def test_structure_detection():
     assert isinstance(sweep_events, list)
 
 
+@given(
+    num_candles=st.integers(min_value=3, max_value=100),
+    lookback=st.integers(min_value=1, max_value=40),
+    bullish=st.booleans()
+)
+@settings(max_examples=50)
+def test_structure_predicates_match_detectors(num_candles, lookback, bullish):
+    """
+    Feature: trading-scanner-python, Property 6: Structure detection across timeframes
+    
+    The boolean structure checks should agree with the event lists of the
+    corresponding detectors.
+    
+    Validates: Requirements 2.2
+    """
+    from app.core.strategy.ohlc_cache import OHLCCache
+    from app.core.strategy.technical_utils import (
+        has_bos, has_choch, has_liquidity_sweep, detect_bos_from_arrays,
+        detect_choch_from_arrays, detect_liquidity_sweep_from_arrays
+    )
+    
+    cache = OHLCCache.build(generate_ohlc_data(num_candles))
+    side = 'bullish' if bullish else 'bearish'
+    
+    assert has_bos(cache, bullish, lookback) == any(
+        e['type'] == f'{side}_bos' for e in detect_bos_from_arrays(cache, lookback)
+    )
+    assert has_choch(cache, bullish, lookback) == any(
+        e['type'] == f'{side}_choch' for e in detect_choch_from_arrays(cache, lookback)
+    )
+    assert has_liquidity_sweep(cache, bullish, lookback) == any(
+        e['type'] == f'{side}_sweep' for e in detect_liquidity_sweep_from_arrays(cache, lookback)
+    )
+
+
 # Feature: trading-scanner-python, Property 8: ATR computation for signals
 @given(
     num_candles=st.integers(min_value=20, max_value=200),